@@ -1,5 +1,6 @@
 import datetime
 import os
+import threading
 import time
 
 from functools import wraps
@@ -8,12 +9,11 @@ from typing import Optional
 import litellm
 
 from tenacity import retry, stop_after_attempt, wait_fixed
-from wandb.sdk.data_types.trace_tree import Trace
 
 from cover_agent.custom_logger import CustomLogger
 from cover_agent.record_replay_manager import RecordReplayManager
 from cover_agent.settings.config_loader import get_settings
-from cover_agent.utils import get_original_caller
+from cover_agent.utils import get_original_caller, log_wandb_trace
 
 
 def conditional_retry(func):
@@ -65,15 +65,72 @@ class AICaller:
             record_mode=record_mode, generate_log_files=generate_log_files
         )
         self.logger = logger or CustomLogger.get_logger(__name__, generate_log_files=generate_log_files)
+        self.total_cached_prompt_tokens = 0
+        # call_model may run concurrently from worker threads (e.g. background failure analyses)
+        self._cached_tokens_lock = threading.Lock()
+
+    def _build_user_content(self, user_prompt: str, cacheable_prefix: str = ""):
+        """
+        Build the content of the user message.
+
+        For Anthropic models, a stable leading part of the user prompt (e.g. the source file that is
+        resent on every fix attempt) is sent as its own content block marked with an ephemeral cache
+        breakpoint, so repeated calls reuse the cached system prompt and prefix. Other providers such
+        as OpenAI cache stable prefixes automatically and receive the plain string.
+
+        Parameters:
+            user_prompt (str): The rendered user prompt.
+            cacheable_prefix (str, optional): Leading part of the user prompt that stays the same across calls.
+
+        Returns:
+            str | list: The user message content.
+        """
+        if (
+            ("claude" in self.model or "anthropic" in self.model)
+            and cacheable_prefix
+            and user_prompt.startswith(cacheable_prefix)
+            and len(user_prompt) > len(cacheable_prefix)
+        ):
+            return [
+                {"type": "text", "text": cacheable_prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": user_prompt[len(cacheable_prefix) :]},
+            ]
+        return user_prompt
+
+    @staticmethod
+    def _get_cached_prompt_tokens(usage) -> int:
+        """
+        Extract the number of prompt tokens that were served from the provider's prompt cache.
+
+        Parameters:
+            usage: The usage section of the model response (dict or usage object).
+
+        Returns:
+            int: The number of cached prompt tokens, or 0 if the provider did not report any.
+        """
+
+        def _field(obj, name):
+            if isinstance(obj, dict):
+                return obj.get(name)
+            return getattr(obj, name, None)
+
+        details = _field(usage, "prompt_tokens_details")
+        cached_tokens = _field(details, "cached_tokens") if details is not None else None
+        if not isinstance(cached_tokens, int):
+            # Anthropic reports cache hits separately from the OpenAI-style details
+            cached_tokens = _field(usage, "cache_read_input_tokens")
+        return cached_tokens if isinstance(cached_tokens, int) else 0
 
     @conditional_retry  # You can access self.enable_retry here
-    def call_model(self, prompt: dict, stream=True):
+    def call_model(self, prompt: dict, stream=True, cacheable_prefix: str = ""):
         """
         Call the language model with the provided prompt and retrieve the response.
 
         Parameters:
             prompt (dict): The prompt to be sent to the language model.
             stream (bool, optional): Whether to stream the response or not. Defaults to True.
+            cacheable_prefix (str, optional): Leading part of the user prompt that stays the same across
+                calls and may be cached by the provider. Defaults to no prefix.
 
         Returns:
             tuple: A tuple containing the response generated by the language model, the number of tokens used from the prompt, and the total number of tokens in the response.
@@ -83,7 +140,7 @@ class AICaller:
         if "system" not in prompt or "user" not in prompt:
             raise KeyError("The prompt dictionary must contain 'system' and 'user' keys.")
         if prompt["system"] == "":
-            messages = [{"role": "user", "content": prompt["user"]}]
+            messages = [{"role": "user", "content": self._build_user_content(prompt["user"], cacheable_prefix)}]
         else:
             if self.model in ["o1-preview", "o1-mini"]:
                 # o1 doesn't accept a system message so we add it to the prompt
@@ -96,7 +153,7 @@ class AICaller:
             else:
                 messages = [
                     {"role": "system", "content": prompt["system"]},
-                    {"role": "user", "content": prompt["user"]},
+                    {"role": "user", "content": self._build_user_content(prompt["user"], cacheable_prefix)},
                 ]
 
         # Default completion parameters
@@ -158,20 +215,26 @@ class AICaller:
             prompt_tokens = int(usage.prompt_tokens)
             completion_tokens = int(usage.completion_tokens)
 
+        cached_prompt_tokens = self._get_cached_prompt_tokens(usage)
+        if cached_prompt_tokens:
+            with self._cached_tokens_lock:
+                self.total_cached_prompt_tokens += cached_prompt_tokens
+                total_cached_prompt_tokens = self.total_cached_prompt_tokens
+            self.logger.info(
+                f"Prompt cache hit: {cached_prompt_tokens}/{prompt_tokens} prompt tokens were cached "
+                f"(total cached so far: {total_cached_prompt_tokens})"
+            )
+
         if "WANDB_API_KEY" in os.environ:
-            try:
-                root_span = Trace(
-                    name="inference_" + datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S"),
-                    kind="llm",  # kind can be "llm", "chain", "agent", or "tool"
-                    inputs={
-                        "user_prompt": prompt["user"],
-                        "system_prompt": prompt["system"],
-                    },
-                    outputs={"model_response": content},
-                )
-                root_span.log(name="inference")
-            except Exception as e:
-                self.logger.error(f"Error logging to W&B: {e}")
+            log_wandb_trace(
+                name="inference_" + datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S"),
+                inputs={
+                    "user_prompt": prompt["user"],
+                    "system_prompt": prompt["system"],
+                },
+                outputs={"model_response": content},
+                logger=self.logger,
+            )
 
         if self.record_mode and self.source_file and self.test_file:
             self.record_replay_manager.record_response(
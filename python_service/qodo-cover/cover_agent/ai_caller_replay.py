@@ -23,13 +23,14 @@ class AICallerReplay:
         self.record_replay_manager = record_replay_manager or RecordReplayManager(record_mode=False)
         self.logger = logger or CustomLogger.get_logger(__name__, generate_log_files=generate_log_files)
 
-    def call_model(self, prompt: dict, stream=True) -> tuple[str, int, int]:
+    def call_model(self, prompt: dict, stream=True, cacheable_prefix: str = "") -> tuple[str, int, int]:
         """
         Replay a recorded response for the given prompt.
 
         Parameters:
             prompt (dict): The prompt to find a matching recorded response for
             stream (bool, optional): Whether to stream the response. Defaults to True.
+            cacheable_prefix (str, optional): Ignored; accepted for compatibility with AICaller.call_model.
 
         Returns:
             tuple: (content, prompt_tokens, completion_tokens)
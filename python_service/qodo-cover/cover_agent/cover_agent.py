@@ -17,6 +17,7 @@ from cover_agent.settings.config_schema import CoverAgentConfig
 from cover_agent.unit_test_db import UnitTestDB
 from cover_agent.unit_test_generator import UnitTestGenerator
 from cover_agent.unit_test_validator import UnitTestValidator
+from cover_agent.utils import flush_wandb_traces
 
 
 class CoverAgent:
@@ -347,6 +348,7 @@ class CoverAgent:
             # Generate report and cleanup
             self.test_db.dump_to_report(self.config.report_filepath)
         if "WANDB_API_KEY" in os.environ:
+            flush_wandb_traces()
             wandb.finish()
 
     def log_coverage(self):
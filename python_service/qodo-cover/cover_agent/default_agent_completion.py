@@ -1,3 +1,5 @@
+import re
+
 from typing import Optional, Tuple
 
 from jinja2 import Environment, StrictUndefined
@@ -70,6 +72,33 @@ class DefaultAgentCompletion(AgentCompletionABC):
 
         return {"system": system_prompt, "user": user_prompt}
 
+    def _build_cacheable_user_prefix(self, file: str, until_variable: str, **kwargs) -> str:
+        """
+        Internal helper that renders the user template of `file` up to and including its first
+        {{ until_variable }} placeholder, for use as a prompt-cache prefix.
+
+        The boundary is taken from the template, not from a search of the rendered prompt, so it does
+        not depend on where the variable's value happens to appear in the rendered text.
+
+        Returns:
+            str: The rendered prefix, or "" if the template has no such placeholder or the part
+            before it cannot be rendered on its own.
+        """
+        settings = get_settings().get(file)
+        if not settings or not hasattr(settings, "user"):
+            return ""
+        placeholder = re.search(r"\{\{\s*" + re.escape(until_variable) + r"\s*\}\}", settings.user)
+        if not placeholder:
+            return ""
+
+        try:
+            environment = Environment(undefined=StrictUndefined)
+            return environment.from_string(settings.user[: placeholder.end()]).render(**kwargs)
+        except Exception as e:
+            # e.g. the placeholder sits inside a block that is not closed before it
+            self.logger.debug(f"Could not render a cacheable prefix for '{file}': {e}")
+            return ""
+
     def generate_tests(
         self,
         source_file_name: str,
@@ -152,17 +181,21 @@ class DefaultAgentCompletion(AgentCompletionABC):
         Returns:
             Tuple[str, int, int, str]: (Fixed test code, input tokens, output tokens, prompt).
         """
-        prompt = self._build_prompt(
-            file="fix_test_prompt", 
+        prompt_variables = dict(
             source_file_name=source_file_name,
             source_file=source_file,
             test_code=test_code,
             error_message=error_message,
             language=language,
             test_file_name=test_file_name,
-            additional_instructions_text=additional_instructions_text
+            additional_instructions_text=additional_instructions_text,
+        )
+        prompt = self._build_prompt(file="fix_test_prompt", **prompt_variables)
+        # The prompt up to the source file is identical across fix attempts, so it can be cached
+        cacheable_prefix = self._build_cacheable_user_prefix("fix_test_prompt", "source_file", **prompt_variables)
+        response, prompt_tokens, completion_tokens = self.caller.call_model(
+            prompt, cacheable_prefix=cacheable_prefix
         )
-        response, prompt_tokens, completion_tokens = self.caller.call_model(prompt)
         return response, prompt_tokens, completion_tokens, prompt["user"]
 
     def analyze_test_failure(
@@ -1,5 +1,6 @@
 import hashlib
 import os
+import threading
 
 from pathlib import Path
 from typing import Any, Optional
@@ -31,6 +32,8 @@ class RecordReplayManager:
 
     SETTINGS = get_settings().get("default")
     HASH_DISPLAY_LENGTH = SETTINGS.record_replay_hash_display_length
+    # Serializes the read-modify-write of response files when LLM calls run on several threads
+    _RECORD_LOCK = threading.Lock()
 
     def __init__(
         self,
@@ -183,40 +186,41 @@ class RecordReplayManager:
         response_file = self._get_response_file_path(source_file, test_file)
         self.logger.info(f"Recording LLM response to {response_file}...")
 
-        # Load existing data or create new
-        meta_key_name = "metadata"
-        files_hash = truncate_hash(self._calculate_files_hash(source_file, test_file), self.HASH_DISPLAY_LENGTH)
-        cached_data = {meta_key_name: {"files_hash": files_hash}}
-
-        if response_file.exists():
-            try:
-                with open(response_file, "r") as f:
-                    loaded_data = yaml.safe_load(f)
-                    if isinstance(loaded_data, dict):
-                        # Preserve metadata and merge other data
-                        cached_data.update({k: v for k, v in loaded_data.items() if k != meta_key_name})
-                        self.logger.debug(f"Loaded existing LLM record with {len(cached_data) - 1} entries.")
-            except yaml.YAMLError:
-                self.logger.warning(f"Invalid YAML in {response_file}, starting fresh.")
-
-        # Create entry
-        prompt_hash = truncate_hash(hashlib.sha256(str(prompt).encode()).hexdigest(), self.HASH_DISPLAY_LENGTH)
-        self.logger.info(f"🔴 Recording new LLM response for {caller_name}() (prompt hash {prompt_hash})...")
-
-        if caller_name not in cached_data:
-            cached_data[caller_name] = {}
-
-        cached_data[caller_name][f"{prompt_hash}"] = {
-            "prompt": prompt,
-            "response": response,
-            "prompt_tokens": prompt_tokens,
-            "completion_tokens": completion_tokens,
-        }
-
-        # Save to file
-        os.makedirs(os.path.dirname(response_file), exist_ok=True)
-        with open(response_file, "w") as f:
-            yaml.safe_dump(cached_data, f, sort_keys=False)
+        with self._RECORD_LOCK:
+            # Load existing data or create new
+            meta_key_name = "metadata"
+            files_hash = truncate_hash(self._calculate_files_hash(source_file, test_file), self.HASH_DISPLAY_LENGTH)
+            cached_data = {meta_key_name: {"files_hash": files_hash}}
+
+            if response_file.exists():
+                try:
+                    with open(response_file, "r") as f:
+                        loaded_data = yaml.safe_load(f)
+                        if isinstance(loaded_data, dict):
+                            # Preserve metadata and merge other data
+                            cached_data.update({k: v for k, v in loaded_data.items() if k != meta_key_name})
+                            self.logger.debug(f"Loaded existing LLM record with {len(cached_data) - 1} entries.")
+                except yaml.YAMLError:
+                    self.logger.warning(f"Invalid YAML in {response_file}, starting fresh.")
+
+            # Create entry
+            prompt_hash = truncate_hash(hashlib.sha256(str(prompt).encode()).hexdigest(), self.HASH_DISPLAY_LENGTH)
+            self.logger.info(f"🔴 Recording new LLM response for {caller_name}() (prompt hash {prompt_hash})...")
+
+            if caller_name not in cached_data:
+                cached_data[caller_name] = {}
+
+            cached_data[caller_name][f"{prompt_hash}"] = {
+                "prompt": prompt,
+                "response": response,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            }
+
+            # Save to file
+            os.makedirs(os.path.dirname(response_file), exist_ok=True)
+            with open(response_file, "w") as f:
+                yaml.safe_dump(cached_data, f, sort_keys=False)
         self.logger.info(f"Record file updated successfully.")
 
     def _calculate_files_hash(self, source_file: str, test_file: str) -> str:
@@ -7,7 +7,7 @@ from cover_agent.agent_completion_abc import AgentCompletionABC
 from cover_agent.custom_logger import CustomLogger
 from cover_agent.file_preprocessor import FilePreprocessor
 from cover_agent.settings.config_loader import get_settings
-from cover_agent.utils import load_yaml
+from cover_agent.utils import get_extension_to_language_map, load_yaml
 
 
 class UnitTestGenerator:
@@ -97,30 +97,11 @@ class UnitTestGenerator:
         Returns:
             str: The programming language inferred from the file extension of the provided source file path. Defaults to 'unknown' if the language cannot be determined.
         """
-        # Retrieve the mapping of languages to their file extensions from settings
-        language_extension_map_org = get_settings().language_extension_map_org
-
-        # Initialize a dictionary to map file extensions to their corresponding languages
-        extension_to_language = {}
-
-        # Populate the extension_to_language dictionary
-        for language, extensions in language_extension_map_org.items():
-            for ext in extensions:
-                extension_to_language[ext] = language
-
         # Extract the file extension from the source file path
-        extension_s = "." + source_file_path.rsplit(".")[-1]
-
-        # Initialize the default language name as 'unknown'
-        language_name = "unknown"
-
-        # Check if the extracted file extension is in the dictionary
-        if extension_s and (extension_s in extension_to_language):
-            # Set the language name based on the file extension
-            language_name = extension_to_language[extension_s]
+        extension_s = os.path.splitext(source_file_path)[1]
 
-        # Return the language name in lowercase
-        return language_name.lower()
+        # Look up the language, defaulting to 'unknown', and return it in lowercase
+        return get_extension_to_language_map().get(extension_s, "unknown").lower()
 
     def check_for_failed_test_runs(self, failed_test_runs):
         """
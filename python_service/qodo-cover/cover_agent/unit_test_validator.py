@@ -1,12 +1,13 @@
-import datetime
+import functools
+import hashlib
 import json
-import logging
 import os
+import re
+import threading
+import time
 
-from typing import Optional, Dict, List, Tuple, Any
-
-from diff_cover.diff_cover_tool import main as diff_cover_main
-from wandb.sdk.data_types.trace_tree import Trace
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, List, Set, Tuple, Any
 
 from cover_agent.agent_completion_abc import AgentCompletionABC
 from cover_agent.coverage_processor import CoverageProcessor
@@ -15,13 +16,124 @@ from cover_agent.file_preprocessor import FilePreprocessor
 from cover_agent.runner import Runner
 from cover_agent.settings.config_loader import get_settings
 from cover_agent.settings.config_schema import CoverageType
-from cover_agent.utils import load_yaml
+from cover_agent.utils import get_extension_to_language_map, load_yaml, log_wandb_trace
 
 from cover_agent.validator_utils.import_utils import clean_imports
 from cover_agent.validator_utils.indentation_utils import prepare_test_code_with_indentation
-from cover_agent.validator_utils.insert_utils import insert_test_code
+from cover_agent.validator_utils.insert_utils import insert_test_code, split_original_content
 from cover_agent.validator_utils.stub_utils import is_trivial_stub
 from cover_agent.validator_utils.validator_utils import validate_initialization_params
+
+
+# Keys extract_error_message needs from a fail_details dict
+_REQUIRED_FAIL_DETAILS_KEYS = frozenset({"processed_test_file", "stderr", "stdout"})
+
+# Errors that stop a test file from loading at all; their own message is a sufficient summary.
+# Only pytest's "E   " traceback lines are matched, since header lines such as
+# "ImportError while importing test module ..." name the error without its cause.
+_LOAD_ERROR_PATTERN = re.compile(
+    r"^E\s+((?:SyntaxError|IndentationError|ModuleNotFoundError|ImportError|NameError)\b[^\n]*)",
+    re.MULTILINE,
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _read_text_file_cached(file_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Read and decode a UTF-8 text file.
+
+    The modification time and size are part of the cache key, so a changed file is
+    read again without any explicit invalidation.
+
+    Parameters:
+        file_path (str): Path to the file.
+        mtime_ns (int): The file's modification time in nanoseconds.
+        size (int): The file's size in bytes.
+
+    Returns:
+        str: The file content.
+    """
+    # One binary read and a single decode are cheaper than text-mode incremental decoding;
+    # line endings are then normalized the same way universal newlines mode would
+    with open(file_path, "rb") as f:
+        content = f.read().decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def _read_included_file(file_path: str) -> Optional[str]:
+    """
+    Read a single included file, returning None if it cannot be read.
+
+    Parameters:
+        file_path (str): Path to the included file.
+
+    Returns:
+        str: The file content, or None if an IOError occurred.
+    """
+    try:
+        with open(file_path, "r") as file:
+            return file.read()
+    except IOError as e:
+        print(f"Error reading file {file_path}: {str(e)}")
+        return None
+
+
+def _tail_output(output: str, max_chars: int) -> str:
+    """
+    Keep only the last max_chars characters of a command's output.
+
+    Parameters:
+        output (str): The captured stdout or stderr.
+        max_chars (int): Maximum number of characters to keep.
+
+    Returns:
+        str: The output, truncated from the front if it was longer than max_chars.
+    """
+    return output[-max_chars:] if len(output) > max_chars else output
+
+
+def _read_head_and_tail(file_path: str, max_bytes: int) -> str:
+    """
+    Read a text file, keeping only its first and last max_bytes // 2 bytes if it is larger than max_bytes.
+
+    Parameters:
+        file_path (str): Path to the file.
+        max_bytes (int): Maximum number of bytes to read.
+
+    Returns:
+        str: The file content, with the omitted middle replaced by a marker line.
+    """
+    with open(file_path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if file_size <= max_bytes:
+            return f.read().decode("utf-8", errors="replace")
+
+        half = max_bytes // 2
+        head = f.read(half)
+        f.seek(-half, os.SEEK_END)
+        tail = f.read()
+    omitted = file_size - len(head) - len(tail)
+    return (
+        head.decode("utf-8", errors="replace")
+        + f"\n... [{omitted} bytes omitted] ...\n"
+        + tail.decode("utf-8", errors="replace")
+    )
+
+
+def diff_cover_main(argv: List[str]):
+    """
+    Run diff-cover's command line entry point.
+
+    diff-cover pulls in pygments and its reporters on import, so it is only imported
+    when a diff coverage report is actually generated.
+    """
+    from diff_cover.diff_cover_tool import main
+
+    return main(argv)
+
+
 class UnitTestValidator:
     """
     Validates and generates unit tests with coverage tracking.
@@ -34,6 +146,10 @@ class UnitTestValidator:
     DEFAULT_MAX_FIX_ATTEMPTS = 1
     COVERAGE_PRECISION = 2  # decimal places for coverage percentages
     DEFAULT_TEST_HEADERS_INDENTATION_ATTEMPTS = 3
+    MAX_INCLUDED_FILES_READERS = 16  # worker threads used to read included files
+    MAX_TEST_OUTPUT_CHARS = 65536  # tail of test stdout/stderr kept for fix prompts and reports
+    MAX_RAW_COVERAGE_REPORT_BYTES = 65536  # head + tail of an unparsable coverage report kept for prompts
+    DEFAULT_MAX_PARALLEL_FAILURE_ANALYSES = 4  # concurrent AI analyses of rejected tests
     
     def __init__(
         self,
@@ -100,6 +216,9 @@ class UnitTestValidator:
         self.project_root = project_root
         self.source_file_path = source_file_path
         self.test_file_path = test_file_path
+        self._relative_source_file_path = self._get_relative_path(source_file_path)
+        self._relative_test_file_path = self._get_relative_path(test_file_path)
+        self._source_file_basename = os.path.basename(source_file_path)
         self.code_coverage_report_path = code_coverage_report_path
         self.test_command = test_command
         self.test_command_dir = test_command_dir
@@ -133,12 +252,25 @@ class UnitTestValidator:
         self.failed_test_runs: List[Dict[str, Any]] = []
         self.total_input_token_count = 0
         self.total_output_token_count = 0
+        self._token_count_lock = threading.Lock()
         self.testing_framework = "Unknown"
         self.code_coverage_report = ""
 
-        # Read source file
-        with open(self.source_file_path, "r") as f:
-            self.source_code = f.read()
+        # Test file content as last read or written by validate_test, used to skip redundant rollbacks
+        self._test_file_content: Optional[str] = None
+
+        # Numbered file content, keyed by path and validated against the cached file content
+        self._numbered_file_cache: Dict[str, Tuple[str, str]] = {}
+
+        # Fingerprints of coverage fix requests already sent to the AI
+        self._fix_request_cache: Set[str] = set()
+
+        # AI failure summaries, keyed by a fingerprint of the failing test file and its output
+        self._error_message_cache: Dict[str, str] = {}
+
+        # AI analyses of rejected tests run in the background while the next test is validated
+        self._failure_analysis_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_failure_analyses: List[Future] = []
 
         # Initialize coverage processor
         self.coverage_processor = CoverageProcessor(
@@ -151,6 +283,17 @@ class UnitTestValidator:
         )
 
 
+    @functools.cached_property
+    def source_code(self) -> str:
+        """
+        Contents of the source file, read on first access.
+
+        Deferring the read keeps construction cheap for runs that exit before any prompt needs
+        the source, such as when the initial coverage run fails.
+        """
+        with open(self.source_file_path, "r") as f:
+            return f.read()
+
     def _configure_diff_coverage(self) -> None:
         """Configure diff coverage settings if enabled."""
         if self.diff_coverage:
@@ -175,6 +318,7 @@ class UnitTestValidator:
                 - code_coverage_report (str): Coverage report string
         """
         self.run_coverage()
+        self.wait_for_failure_analyses()
         return (
             self.failed_test_runs,
             self.language,
@@ -192,106 +336,38 @@ class UnitTestValidator:
         Returns:
             str: The programming language inferred from the file extension of the provided source file path. Defaults to 'unknown' if the language cannot be determined.
         """
-        # Retrieve the mapping of languages to their file extensions from settings
-        language_extension_map_org = get_settings().language_extension_map_org
-
-        # Initialize a dictionary to map file extensions to their corresponding languages
-        extension_to_language = {}
-
-        # Populate the extension_to_language dictionary
-        for language, extensions in language_extension_map_org.items():
-            for ext in extensions:
-                extension_to_language[ext] = language
-
         # Extract the file extension from the source file path
-        extension_s = "." + source_file_path.rsplit(".")[-1]
-
-        # Initialize the default language name as 'unknown'
-        language_name = "unknown"
-
-        # Check if the extracted file extension is in the dictionary
-        if extension_s and (extension_s in extension_to_language):
-            # Set the language name based on the file extension
-            language_name = extension_to_language[extension_s]
+        extension_s = os.path.splitext(source_file_path)[1]
 
-        # Return the language name in lowercase
-        return language_name.lower()
+        # Look up the language, defaulting to 'unknown', and return it in lowercase
+        return get_extension_to_language_map().get(extension_s, "unknown").lower()
 
     def initial_test_suite_analysis(self) -> None:
         """
         Perform the initial analysis of the test suite structure.
         
         This method analyzes test headers indentation, line numbers for inserting
-        tests and imports, and detects the testing framework.
+        tests and imports, and detects the testing framework. The two analyses are
+        independent AI calls, so they run concurrently.
         
         Raises:
             Exception: If analysis fails after all attempts.
         """
         try:
             settings = get_settings().get("default")
-            test_headers_indentation = None
             allowed_attempts = settings.get(
                 "test_headers_indentation_attempts", 
                 self.DEFAULT_TEST_HEADERS_INDENTATION_ATTEMPTS
             )
-            counter_attempts = 0
-            
-            # Analyze test headers indentation
-            while test_headers_indentation is None and counter_attempts < allowed_attempts:
-                test_file_content = self._read_file(self.test_file_path)
-                response, prompt_token_count, response_token_count, prompt = (
-                    self.agent_completion.analyze_suite_test_headers_indentation(
-                        language=self.language,
-                        test_file_name=self._get_relative_path(self.test_file_path),
-                        test_file=test_file_content,
-                    )
-                )
-
-                self._update_token_counts(prompt_token_count, response_token_count)
-                tests_dict = load_yaml(response)
-                test_headers_indentation = tests_dict.get("test_headers_indentation", None)
-                counter_attempts += 1
-
-            if test_headers_indentation is None:
-                raise Exception(
-                    f"Failed to analyze test headers indentation. YAML response: {response}. tests_dict: {tests_dict}"
-                )
 
-            # Analyze insertion points
-            relevant_line_number_to_insert_tests_after = None
-            relevant_line_number_to_insert_imports_after = None
-            counter_attempts = 0
-            
-            while not relevant_line_number_to_insert_tests_after and counter_attempts < allowed_attempts:
-                test_file_numbered = self._create_numbered_file_content(self.test_file_path)
-                response, prompt_token_count, response_token_count, prompt = (
-                    self.agent_completion.analyze_test_insert_line(
-                        language=self.language,
-                        test_file_numbered=test_file_numbered,
-                        additional_instructions_text=self.additional_instructions,
-                        test_file_name=self._get_relative_path(self.test_file_path),
-                    )
-                )
-
-                self._update_token_counts(prompt_token_count, response_token_count)
-                tests_dict = load_yaml(response)
-                relevant_line_number_to_insert_tests_after = tests_dict.get(
-                    "relevant_line_number_to_insert_tests_after", None
-                )
-                relevant_line_number_to_insert_imports_after = tests_dict.get(
-                    "relevant_line_number_to_insert_imports_after", None
-                )
-                self.testing_framework = tests_dict.get("testing_framework", "Unknown")
-                counter_attempts += 1
-
-            if not relevant_line_number_to_insert_tests_after:
-                raise Exception(
-                    f"Failed to analyze the relevant line number to insert new tests. tests_dict: {tests_dict}"
-                )
-            if not relevant_line_number_to_insert_imports_after:
-                raise Exception(
-                    f"Failed to analyze the relevant line number to insert new imports. tests_dict: {tests_dict}"
-                )
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                indentation_future = executor.submit(self._analyze_test_headers_indentation, allowed_attempts)
+                insertion_future = executor.submit(self._analyze_test_insertion_points, allowed_attempts)
+                test_headers_indentation = indentation_future.result()
+                (
+                    relevant_line_number_to_insert_tests_after,
+                    relevant_line_number_to_insert_imports_after,
+                ) = insertion_future.result()
 
             self.test_headers_indentation = test_headers_indentation
             self.relevant_line_number_to_insert_tests_after = relevant_line_number_to_insert_tests_after
@@ -301,6 +377,87 @@ class UnitTestValidator:
             self.logger.error(f"Error during initial test suite analysis: {e}")
             raise Exception("Error during initial test suite analysis")
 
+    def _analyze_test_headers_indentation(self, allowed_attempts: int) -> int:
+        """
+        Ask the AI for the indentation of the test headers, retrying up to allowed_attempts times.
+
+        Returns:
+            int: The detected test headers indentation.
+
+        Raises:
+            Exception: If no indentation was detected.
+        """
+        test_headers_indentation = None
+        counter_attempts = 0
+
+        while test_headers_indentation is None and counter_attempts < allowed_attempts:
+            test_file_content = self._read_file(self.test_file_path)
+            response, prompt_token_count, response_token_count, prompt = (
+                self.agent_completion.analyze_suite_test_headers_indentation(
+                    language=self.language,
+                    test_file_name=self._relative_test_file_path,
+                    test_file=test_file_content,
+                )
+            )
+
+            self._update_token_counts(prompt_token_count, response_token_count)
+            tests_dict = load_yaml(response)
+            test_headers_indentation = tests_dict.get("test_headers_indentation", None)
+            counter_attempts += 1
+
+        if test_headers_indentation is None:
+            raise Exception(
+                f"Failed to analyze test headers indentation. YAML response: {response}. tests_dict: {tests_dict}"
+            )
+        return test_headers_indentation
+
+    def _analyze_test_insertion_points(self, allowed_attempts: int) -> Tuple[int, int]:
+        """
+        Ask the AI for the lines after which new tests and imports should be inserted, retrying up
+        to allowed_attempts times. Also records the detected testing framework.
+
+        Returns:
+            Tuple of (relevant_line_number_to_insert_tests_after, relevant_line_number_to_insert_imports_after)
+
+        Raises:
+            Exception: If either line number was not detected.
+        """
+        relevant_line_number_to_insert_tests_after = None
+        relevant_line_number_to_insert_imports_after = None
+        counter_attempts = 0
+
+        while not relevant_line_number_to_insert_tests_after and counter_attempts < allowed_attempts:
+            test_file_numbered = self._create_numbered_file_content(self.test_file_path)
+            response, prompt_token_count, response_token_count, prompt = (
+                self.agent_completion.analyze_test_insert_line(
+                    language=self.language,
+                    test_file_numbered=test_file_numbered,
+                    additional_instructions_text=self.additional_instructions,
+                    test_file_name=self._relative_test_file_path,
+                )
+            )
+
+            self._update_token_counts(prompt_token_count, response_token_count)
+            tests_dict = load_yaml(response)
+            relevant_line_number_to_insert_tests_after = tests_dict.get(
+                "relevant_line_number_to_insert_tests_after", None
+            )
+            relevant_line_number_to_insert_imports_after = tests_dict.get(
+                "relevant_line_number_to_insert_imports_after", None
+            )
+            self.testing_framework = tests_dict.get("testing_framework", "Unknown")
+            counter_attempts += 1
+
+        if not relevant_line_number_to_insert_tests_after:
+            raise Exception(
+                f"Failed to analyze the relevant line number to insert new tests. tests_dict: {tests_dict}"
+            )
+        if not relevant_line_number_to_insert_imports_after:
+            raise Exception(
+                f"Failed to analyze the relevant line number to insert new imports. tests_dict: {tests_dict}"
+            )
+        return relevant_line_number_to_insert_tests_after, relevant_line_number_to_insert_imports_after
+
     def _create_numbered_file_content(self, file_path: str) -> str:
         """
         Create a numbered version of file content for analysis.
@@ -312,8 +469,16 @@ class UnitTestValidator:
             str: File content with line numbers
         """
         content = self._read_file(file_path)
+
+        # _read_file hands back the same string object while the file is unchanged
+        cached = self._numbered_file_cache.get(file_path)
+        if cached and cached[0] is content:
+            return cached[1]
+
         lines = content.split("\n")
-        return "\n".join(f"{i + 1} {line}" for i, line in enumerate(lines))
+        numbered_content = "\n".join(f"{i + 1} {line}" for i, line in enumerate(lines))
+        self._numbered_file_cache[file_path] = (content, numbered_content)
+        return numbered_content
 
     def run_coverage(self) -> None:
         """
@@ -337,7 +502,7 @@ class UnitTestValidator:
         try:
             coverage, coverage_percentages = self.post_process_coverage_report(time_of_test_command)
             self.current_coverage = coverage
-            self.last_coverage_percentages = coverage_percentages.copy()
+            self.last_coverage_percentages = coverage_percentages
             self.logger.info(f"Initial coverage: {self.format_coverage_percentage(self.current_coverage)}%")
 
         except AssertionError as error:
@@ -351,8 +516,9 @@ class UnitTestValidator:
             self.logger.info(
                 "Will default to using the full coverage report. You will need to check coverage manually for each passing test."
             )
-            with open(self.code_coverage_report_path, "r") as f:
-                self.code_coverage_report = f.read()
+            self.code_coverage_report = _read_head_and_tail(
+                self.code_coverage_report_path, self.MAX_RAW_COVERAGE_REPORT_BYTES
+            )
 
     @staticmethod
     def get_included_files(included_files):
@@ -366,21 +532,21 @@ class UnitTestValidator:
             str: A string containing the concatenated contents of the included files, or an empty string if the input list is empty.
         """
         if included_files:
+            # File reads release the GIL, so fetch them concurrently; map() keeps the input order
+            max_workers = min(UnitTestValidator.MAX_INCLUDED_FILES_READERS, len(included_files))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                contents = list(executor.map(_read_included_file, included_files))
+
             included_files_content = []
             file_names = []
-            for file_path in included_files:
-                try:
-                    with open(file_path, "r") as file:
-                        included_files_content.append(file.read())
-                        file_names.append(file_path)
-                except IOError as e:
-                    print(f"Error reading file {file_path}: {str(e)}")
-            out_str = ""
-            if included_files_content:
-                for i, content in enumerate(included_files_content):
-                    out_str += f"file_path: `{file_names[i]}`\ncontent:\n```\n{content}\n```\n"
-
-            return out_str.strip()
+            for file_path, content in zip(included_files, contents):
+                if content is not None:
+                    included_files_content.append(content)
+                    file_names.append(file_path)
+            return "\n".join(
+                f"file_path: `{file_name}`\ncontent:\n```\n{content}\n```"
+                for file_name, content in zip(file_names, included_files_content)
+            ).strip()
         return ""
 
     def validate_test(self, generated_test: Dict[str, Any]) -> Dict[str, Any]:
@@ -400,12 +566,15 @@ class UnitTestValidator:
         # Store original content
         with open(self.test_file_path, "r") as test_file:
             original_content = test_file.read()
+        self._test_file_content = original_content
+        # Every attempt inserts into the same original content, so split it only once
+        split_content = split_original_content(original_content)
 
         current_test_code = generated_test.get("test_code", "").rstrip()
         additional_imports = clean_imports(generated_test.get("new_imports_code", "").strip())
         
-        # Track fix history to avoid repeating same fixes
-        previous_test_codes = [current_test_code]
+        # Track fix history to avoid repeating same fixes; a set keeps duplicate checks O(1)
+        previous_test_codes = {current_test_code}
         
         # Initialize result variables
         final_exit_code = -1
@@ -417,10 +586,9 @@ class UnitTestValidator:
         attempts_range = range(self.max_fix_attempts + 1)
         coverage_increased = False
 
+        # Each candidate is built from original_content in memory, so the file on disk is
+        # only overwritten once per attempt and restored once when validation finishes.
         for attempt in attempts_range:
-            # Restore original file state
-            self._restore_test_file(original_content)
-
             # Prepare test code with proper indentation
             test_code_indented = prepare_test_code_with_indentation(
                 needed_indent=self.test_headers_indentation,
@@ -433,7 +601,8 @@ class UnitTestValidator:
                 test_code_indented = test_code_indented, 
                 additional_imports = additional_imports,
                 import_index = self.relevant_line_number_to_insert_imports_after,
-                test_index = self.relevant_line_number_to_insert_tests_after
+                test_index = self.relevant_line_number_to_insert_tests_after,
+                split_content = split_content
             )
             
             if not processed_test:
@@ -442,7 +611,7 @@ class UnitTestValidator:
             # Write the candidate test file
             with open(self.test_file_path, "w") as test_file:
                 test_file.write(processed_test)
-                test_file.flush()
+            self._test_file_content = processed_test
 
             # Run the test command (with flakiness retry)
             final_stdout, final_stderr, final_exit_code, time_of_test_command = self._run_test_with_retry(attempt)
@@ -462,7 +631,7 @@ class UnitTestValidator:
                     break
                 elif coverage_result.get("new_test_code"):
                     current_test_code = coverage_result["new_test_code"]
-                    previous_test_codes.append(current_test_code)
+                    previous_test_codes.add(current_test_code)
                     continue
             else:
                 # Test failed - attempt to fix
@@ -475,7 +644,7 @@ class UnitTestValidator:
                     break
                 elif fix_result.get("new_test_code"):
                     current_test_code = fix_result["new_test_code"]
-                    previous_test_codes.append(current_test_code)
+                    previous_test_codes.add(current_test_code)
                     continue
 
         # Final decision logic
@@ -493,15 +662,27 @@ class UnitTestValidator:
         )
 
     def _restore_test_file(self, original_content: str) -> None:
-        """Restore test file to original content."""
+        """
+        Restore test file to original content.
+
+        The file is rewritten in place, the same way candidates are written, so symlinks, hard
+        links, ownership and ACLs of the test file are preserved. The write is skipped when the
+        file still holds the original content, e.g. when no candidate was ever written.
+        """
+        if self._test_file_content is not None and self._test_file_content == original_content:
+            return
+
         with open(self.test_file_path, "w") as test_file:
             test_file.write(original_content)
-            test_file.flush()
-
+        self._test_file_content = original_content
 
     def _run_test_with_retry(self, attempt: int) -> Tuple[str, str, int, float]:
         """
         Run test command with retry for flakiness.
+
+        When `run_flakiness_checks_in_parallel` is enabled in the settings, all but the last
+        run are dispatched concurrently and the last run is executed on its own, so the coverage
+        report left on disk always comes from a single, uncontended test run.
         
         Parameters:
             attempt (int): Current attempt number
@@ -509,7 +690,31 @@ class UnitTestValidator:
         Returns:
             Tuple of (stdout, stderr, exit_code, time_of_test_command)
         """
-        for _ in range(self.num_attempts):
+        serial_runs = self.num_attempts
+        run_in_parallel = get_settings().get("default").get("run_flakiness_checks_in_parallel", False)
+        if run_in_parallel and self.num_attempts > 1:
+            self.logger.info(
+                f'Running {self.num_attempts - 1} concurrent flakiness checks '
+                f'(Attempt {attempt+1}/{self.max_fix_attempts+1}) with command: "{self.test_command}"'
+            )
+            with ThreadPoolExecutor(max_workers=self.num_attempts - 1) as executor:
+                futures = [
+                    executor.submit(
+                        Runner.run_command,
+                        command=self.test_command,
+                        cwd=self.test_command_dir,
+                        max_run_time_sec=self.max_run_time_sec,
+                    )
+                    for _ in range(self.num_attempts - 1)
+                ]
+                results = [future.result() for future in futures]
+
+            for stdout, stderr, exit_code, time_of_test_command in results:
+                if exit_code != 0:
+                    return self._tail_test_output(stdout, stderr, exit_code, time_of_test_command)
+            serial_runs = 1
+
+        for _ in range(serial_runs):
             self.logger.info(
                 f'Running test (Attempt {attempt+1}/{self.max_fix_attempts+1}) '
                 f'with command: "{self.test_command}"'
@@ -522,7 +727,24 @@ class UnitTestValidator:
             if exit_code != 0:
                 break  # Break flakiness loop if failed
         
-        return stdout, stderr, exit_code, time_of_test_command
+        return self._tail_test_output(stdout, stderr, exit_code, time_of_test_command)
+
+    def _tail_test_output(
+        self, stdout: str, stderr: str, exit_code: int, time_of_test_command: float
+    ) -> Tuple[str, str, int, float]:
+        """
+        Trim a test run's output to its tail.
+
+        Failures and summaries are reported at the end of the output, so the tail is all the fix
+        prompts and failure reports need; dropping the rest keeps verbose suites from inflating
+        memory use and prompt size.
+        """
+        return (
+            _tail_output(stdout, self.MAX_TEST_OUTPUT_CHARS),
+            _tail_output(stderr, self.MAX_TEST_OUTPUT_CHARS),
+            exit_code,
+            time_of_test_command,
+        )
 
     def _check_coverage_increase(
         self,
@@ -530,7 +752,7 @@ class UnitTestValidator:
         attempt: int,
         generated_test: Dict[str, Any],
         current_test_code: str,
-        previous_test_codes: List[str]
+        previous_test_codes: Set[str]
     ) -> Dict[str, Any]:
         """
         Check if coverage increased and attempt fix if not.
@@ -575,7 +797,7 @@ class UnitTestValidator:
         self,
         generated_test: Dict[str, Any],
         current_test_code: str,
-        previous_test_codes: List[str],
+        previous_test_codes: Set[str],
         new_percentage_covered: float
     ) -> Optional[str]:
         """
@@ -602,17 +824,26 @@ class UnitTestValidator:
         - Avoid testing the same already-covered path again.
         """
 
+        # An identical fix request was already answered this session; asking again would just loop
+        fix_request_key = hashlib.blake2b(
+            (current_test_code + enhanced_error_message).encode(), digest_size=16
+        ).hexdigest()
+        if fix_request_key in self._fix_request_cache:
+            self.logger.warning("Fix request already sent to AI (coverage mode). Stopping fix attempts")
+            return None
+
         fix_response, _, _, _ = self.agent_completion.fix_test(
-            source_file_name=self._get_relative_path(self.source_file_path),
+            source_file_name=self._relative_source_file_path,
             source_file=self.source_code,
             test_code=current_test_code,
             error_message=enhanced_error_message,
             language=self.language,
-            test_file_name=self._get_relative_path(self.test_file_path),
+            test_file_name=self._relative_test_file_path,
         )
 
         try:
-            fix_dict = load_yaml(fix_response)
+            # Without a test_code key the raw response is used as is, so skip the YAML parse and its repair passes
+            fix_dict = load_yaml(fix_response) if "test_code" in fix_response else None
             if isinstance(fix_dict, dict) and "test_code" in fix_dict:
                 new_test_code = fix_dict["test_code"]
             else:
@@ -629,6 +860,7 @@ class UnitTestValidator:
                 return None
 
             self.logger.info("Received potential fix from AI (coverage mode). Retrying validation")
+            self._fix_request_cache.add(fix_request_key)
             return new_test_code
             
         except Exception as parse_error:
@@ -644,7 +876,7 @@ class UnitTestValidator:
         final_exit_code: str,
         final_stdout: str,
         final_stderr: str,
-        previous_test_codes: List[str]
+        previous_test_codes: Set[str]
     ) -> Dict[str, Any]:
         """
         Attempt to fix a failing test using AI.
@@ -681,7 +913,7 @@ class UnitTestValidator:
             }
             error_message = self.extract_error_message(fail_details)
             if error_message:
-                logging.error(f"Error message summary:\n{error_message}")
+                self.logger.error("Error message summary:\n%s", error_message)
 
             self.failed_test_runs.append(
                 {"code": generated_test, "error_message": error_message}
@@ -740,17 +972,18 @@ class UnitTestValidator:
         The test must include actual assertions and test logic.
         """       
         fix_response, _, _, _ = self.agent_completion.fix_test(
-            source_file_name=self._get_relative_path(self.source_file_path),
+            source_file_name=self._relative_source_file_path,
             source_file=self.source_code,
             test_code=current_test_code,
             error_message=enhanced_error_message,
             language=self.language,
-            test_file_name=self._get_relative_path(self.test_file_path),
+            test_file_name=self._relative_test_file_path,
             additional_instructions_text= error_message
         )
         
         try:
-            fix_dict = load_yaml(fix_response)
+            # Without a test_code key the raw response is used as is, so skip the YAML parse and its repair passes
+            fix_dict = load_yaml(fix_response) if "test_code" in fix_response else None
             if isinstance(fix_dict, dict) and "test_code" in fix_dict:
                 return fix_dict["test_code"]
             else:
@@ -768,7 +1001,7 @@ class UnitTestValidator:
         final_exit_code: int,
         final_stdout: str,
         final_stderr: str,
-        previous_test_codes: List[str]
+        previous_test_codes: Set[str]
     ) -> Dict[str, Any]:
         """
         Handle test failure by rolling back and logging.
@@ -777,8 +1010,7 @@ class UnitTestValidator:
             dict: Failure details
         """
         # Rollback
-        with open(self.test_file_path, "w") as test_file:
-            test_file.write(original_content)
+        self._restore_test_file(original_content)
         
         self.logger.info(f"Skipping a generated test that failed after {len(previous_test_codes)} attempts")
         
@@ -796,26 +1028,70 @@ class UnitTestValidator:
             "fix_attempts": len(previous_test_codes) - 1,
         }
 
+        # The failure analysis is only needed by the next generation prompt, so let it run
+        # while the following tests are validated; get_coverage() waits for it.
+        failed_test_run = {"code": generated_test, "error_message": ""}
+        self.failed_test_runs.append(failed_test_run)
+        self._submit_failure_analysis(dict(fail_details), failed_test_run)
+
+        return fail_details
+
+    def _submit_failure_analysis(self, fail_details: Dict[str, Any], failed_test_run: Dict[str, Any]) -> None:
+        """
+        Queue the AI analysis of a rejected test on the background executor.
+
+        Parameters:
+            fail_details (dict): Failure details of the rejected test.
+            failed_test_run (dict): The entry in failed_test_runs that receives the error message.
+        """
+        if self._failure_analysis_executor is None:
+            max_workers = get_settings().get("default").get(
+                "max_parallel_failure_analyses", self.DEFAULT_MAX_PARALLEL_FAILURE_ANALYSES
+            )
+            self._failure_analysis_executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        self._pending_failure_analyses.append(
+            self._failure_analysis_executor.submit(self._analyze_failure, fail_details, failed_test_run)
+        )
+
+    def _analyze_failure(self, fail_details: Dict[str, Any], failed_test_run: Dict[str, Any]) -> None:
+        """
+        Summarize why a rejected test failed and record it for the next generation prompt.
+
+        Parameters:
+            fail_details (dict): Failure details of the rejected test.
+            failed_test_run (dict): The entry in failed_test_runs that receives the error message.
+        """
         error_message = self.extract_error_message(fail_details)
         if error_message:
-            logging.error(f"Error message summary:\n{error_message}")
+            self.logger.error("Error message summary:\n%s", error_message)
 
-        self.failed_test_runs.append(
-            {"code": generated_test, "error_message": error_message}
-        )
+        failed_test_run["error_message"] = error_message
 
         # Log to WandB if configured
         if "WANDB_API_KEY" in os.environ:
             fail_details["error_message"] = error_message
-            root_span = Trace(
-                name="fail_details_" + datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S"),
-                kind="llm",
+            log_wandb_trace(
+                name="fail_details_" + time.strftime("%Y-%m-%d_%H-%M-%S"),
                 inputs={"test_code": fail_details["test"]},
                 outputs=fail_details,
+                logger=self.logger,
             )
-            root_span.log(name="inference")
 
-        return fail_details
+    def wait_for_failure_analyses(self) -> None:
+        """
+        Block until every queued failure analysis has recorded its error message, then shut the
+        executor down. A new one is created on the next submitted analysis.
+        """
+        pending, self._pending_failure_analyses = self._pending_failure_analyses, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"Error analyzing a failed test: {e}")
+
+        if self._failure_analysis_executor is not None:
+            self._failure_analysis_executor.shutdown(wait=True)
+            self._failure_analysis_executor = None
 
     def _handle_test_success(
         self,
@@ -827,7 +1103,7 @@ class UnitTestValidator:
         final_stderr: str,
         time_of_test_command: float,
         additional_imports: str,
-        previous_test_codes: List[str]
+        previous_test_codes: Set[str]
     ) -> Dict[str, Any]:
         """
         Handle successful test with coverage increase.
@@ -865,13 +1141,12 @@ class UnitTestValidator:
                 })
 
                 if "WANDB_API_KEY" in os.environ:
-                    root_span = Trace(
-                        name="fail_details_" + datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S"),
-                        kind="llm",
+                    log_wandb_trace(
+                        name="fail_details_" + time.strftime("%Y-%m-%d_%H-%M-%S"),
                         inputs={"test_code": fail_details["test"]},
-                        outputs=fail_details,
+                        outputs=dict(fail_details),
+                        logger=self.logger,
                     )
-                    root_span.log(name="inference")
 
                 return fail_details
                 
@@ -901,7 +1176,7 @@ class UnitTestValidator:
         self._log_coverage_improvements(new_coverage_percentages)
         
         self.current_coverage = new_percentage_covered
-        self.last_coverage_percentages = new_coverage_percentages.copy()
+        self.last_coverage_percentages = new_coverage_percentages
 
         self.logger.info(
             f"Test passed and coverage increased after {len(previous_test_codes)} attempts. "
@@ -924,22 +1199,25 @@ class UnitTestValidator:
 
     def _log_coverage_improvements(self, new_coverage_percentages: Dict[str, float]) -> None:
         """Log which files had coverage improvements."""
-        for key in new_coverage_percentages:
-            if key not in self.last_coverage_percentages:
+        last_coverage_percentages = self.last_coverage_percentages
+
+        # Only files whose coverage went up are logged, so only they are formatted.
+        # Iterating the new report keeps the log in report order.
+        for key, new_coverage in new_coverage_percentages.items():
+            # One lookup per file; files missing from the previous report are skipped
+            old_coverage = last_coverage_percentages.get(key)
+            if old_coverage is None or new_coverage <= old_coverage:
                 continue
-                
-            old_cov = self.format_coverage_percentage(self.last_coverage_percentages[key])
-            new_cov = self.format_coverage_percentage(new_coverage_percentages[key])
-            
-            if new_coverage_percentages[key] > self.last_coverage_percentages[key]:
-                if key == self.source_file_path.split("/")[-1]:
-                    self.logger.info(
-                        f"Coverage for provided source file: {key} increased from {old_cov} to {new_cov}"
-                    )
-                else:
-                    self.logger.info(
-                        f"Coverage for non-source file: {key} increased from {old_cov} to {new_cov}"
-                    )
+            old_cov = self.format_coverage_percentage(old_coverage)
+            new_cov = self.format_coverage_percentage(new_coverage)
+            if key == self._source_file_basename:
+                self.logger.info(
+                    f"Coverage for provided source file: {key} increased from {old_cov} to {new_cov}"
+                )
+            else:
+                self.logger.info(
+                    f"Coverage for non-source file: {key} increased from {old_cov} to {new_cov}"
+                )
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -971,12 +1249,16 @@ class UnitTestValidator:
         Returns:
             str: JSON representation of validator state
         """
-        return json.dumps(self.to_dict(), indent=2)
+        # Serialize enums (e.g. CoverageType) by value
+        return json.dumps(self.to_dict(), indent=2, default=lambda obj: obj.value)
 
     def extract_error_message(self, fail_details: Dict[str, Any]) -> str:
         """
         Extract error message from fail details using AI analysis.
 
+        Failures where the test file could not load (syntax, import and name errors) are
+        summarized by their own error line, and identical failures reuse the earlier analysis.
+
         Parameters:
             fail_details (dict): Dictionary containing test failure details
 
@@ -987,20 +1269,38 @@ class UnitTestValidator:
             if not self._validate_fail_details(fail_details):
                 self.logger.error("Invalid fail_details structure")
                 return ""
-            
+
+            load_error = (
+                _LOAD_ERROR_PATTERN.search(fail_details["stderr"])
+                or _LOAD_ERROR_PATTERN.search(fail_details["stdout"])
+            )
+            if load_error:
+                return load_error.group(1).strip()
+
+            error_message_key = hashlib.blake2b(
+                "\0".join(
+                    (fail_details["processed_test_file"], fail_details["stderr"], fail_details["stdout"])
+                ).encode(),
+                digest_size=16,
+            ).hexdigest()
+            if error_message_key in self._error_message_cache:
+                return self._error_message_cache[error_message_key]
+
             response, prompt_token_count, response_token_count, prompt = (
                 self.agent_completion.analyze_test_failure(
-                    source_file_name=self._get_relative_path(self.source_file_path),
+                    source_file_name=self._relative_source_file_path,
                     source_file=self._read_file(self.source_file_path),
                     processed_test_file=fail_details["processed_test_file"],
                     stderr=fail_details["stderr"],
                     stdout=fail_details["stdout"],
-                    test_file_name=self._get_relative_path(self.test_file_path),
+                    test_file_name=self._relative_test_file_path,
                 )
             )
             
             self._update_token_counts(prompt_token_count, response_token_count)
-            return response.strip()
+            error_message = response.strip()
+            self._error_message_cache[error_message_key] = error_message
+            return error_message
             
         except KeyError as e:
             self.logger.error(f"Missing required key in fail_details: {e}")
@@ -1011,8 +1311,7 @@ class UnitTestValidator:
 
     def _validate_fail_details(self, fail_details: Dict[str, Any]) -> bool:
         """Validate that fail_details contains required keys."""
-        required_keys = ["processed_test_file", "stderr", "stdout"]
-        return all(key in fail_details for key in required_keys)
+        return _REQUIRED_FAIL_DETAILS_KEYS <= fail_details.keys()
 
     def post_process_coverage_report(
         self, time_of_test_command: float
@@ -1163,14 +1462,18 @@ class UnitTestValidator:
         return file_path
 
     def _update_token_counts(self, input_tokens: int, output_tokens: int) -> None:
-        """Update total token counts."""
-        self.total_input_token_count += input_tokens
-        self.total_output_token_count += output_tokens
+        """Update total token counts. Safe to call from concurrent AI calls."""
+        with self._token_count_lock:
+            self.total_input_token_count += input_tokens
+            self.total_output_token_count += output_tokens
 
     def _read_file(self, file_path: str) -> str:
         """
         Read file contents safely.
 
+        Contents are cached process-wide, shared between validator instances, and reused
+        for as long as the file's modification time and size are unchanged.
+
         Parameters:
             file_path (str): Path to the file
 
@@ -1178,8 +1481,8 @@ class UnitTestValidator:
             str: File content or error message
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
+            stat_result = os.stat(file_path)
+            return _read_text_file_cached(file_path, stat_result.st_mtime_ns, stat_result.st_size)
         except FileNotFoundError:
             error_msg = f"File not found: {file_path}"
             self.logger.error(error_msg)
@@ -1207,7 +1510,8 @@ class UnitTestValidator:
 
     def reset_coverage_state(self) -> None:
         """Reset coverage tracking state."""
-        self.last_coverage_percentages.clear()
+        self.wait_for_failure_analyses()
+        self.last_coverage_percentages = {}
         self.failed_test_runs.clear()
         self.code_coverage_report = ""
         self.logger.info("Coverage state reset")
\ No newline at end of file
@@ -1,10 +1,15 @@
 import argparse
+import atexit
+import functools
 import inspect
 import logging
 import os
 import re
+import threading
 
-from typing import List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 import yaml
 
@@ -17,6 +22,41 @@ from cover_agent.settings.token_handling import TokenEncoder, clip_tokens
 from cover_agent.version import __version__
 
 
+# Use the libyaml-backed loader when PyYAML was built with it; it is much faster than the pure-Python one
+_YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Recent YAML texts that failed to parse, mapped to their error message
+_YAML_PARSE_ERROR_CACHE_SIZE = 16
+_yaml_parse_errors: "OrderedDict[str, str]" = OrderedDict()
+_yaml_parse_errors_lock = threading.Lock()
+
+
+def _safe_load_yaml(text: str):
+    """
+    Parse YAML text with the fastest available safe loader.
+
+    Texts that failed to parse are remembered, since retries often get the same malformed AI output
+    back and would otherwise re-run every repair pass on it. Only the immutable input text and the
+    error message are kept, so parsed data is never shared between callers.
+    """
+    with _yaml_parse_errors_lock:
+        error_message = _yaml_parse_errors.get(text)
+        if error_message is not None:
+            _yaml_parse_errors.move_to_end(text)
+    if error_message is not None:
+        raise yaml.YAMLError(error_message)
+
+    try:
+        return yaml.load(text, Loader=_YAML_SAFE_LOADER)
+    except yaml.YAMLError as e:
+        with _yaml_parse_errors_lock:
+            _yaml_parse_errors[text] = str(e)
+            if len(_yaml_parse_errors) > _YAML_PARSE_ERROR_CACHE_SIZE:
+                _yaml_parse_errors.popitem(last=False)
+        raise
+
+
 def load_yaml(response_text: str, keys_fix_yaml: List[str] = []) -> dict:
     """
     Load and parse YAML data from a given response text.
@@ -36,7 +76,7 @@ def load_yaml(response_text: str, keys_fix_yaml: List[str] = []) -> dict:
     """
     response_text = response_text.strip().removeprefix("```yaml").rstrip("`")
     try:
-        data = yaml.safe_load(response_text)
+        data = _safe_load_yaml(response_text)
     except Exception as e:
         logging.info(f"Failed to parse AI prediction: {e}. Attempting to fix YAML formatting.")
         data = try_fix_yaml(response_text, keys_fix_yaml=keys_fix_yaml)
@@ -76,7 +116,7 @@ def try_fix_yaml(response_text: str, keys_fix_yaml: List[str] = []) -> dict:
             if key in response_text_lines_copy[i] and not "|-" in response_text_lines_copy[i]:
                 response_text_lines_copy[i] = response_text_lines_copy[i].replace(f"{key}", f"{key} |-\n        ")
     try:
-        data = yaml.safe_load("\n".join(response_text_lines_copy))
+        data = _safe_load_yaml("\n".join(response_text_lines_copy))
         logging.info(f"Successfully parsed AI prediction after adding |-\n")
         return data
     except:
@@ -88,7 +128,7 @@ def try_fix_yaml(response_text: str, keys_fix_yaml: List[str] = []) -> dict:
     if snippet:
         snippet_text = snippet.group()
         try:
-            data = yaml.safe_load(snippet_text.removeprefix("```yaml").rstrip("`"))
+            data = _safe_load_yaml(snippet_text.removeprefix("```yaml").rstrip("`"))
             logging.info(f"Successfully parsed AI prediction after extracting yaml snippet")
             return data
         except:
@@ -97,7 +137,7 @@ def try_fix_yaml(response_text: str, keys_fix_yaml: List[str] = []) -> dict:
     # third fallback - try to remove leading and trailing curly brackets
     response_text_copy = response_text.strip().rstrip().removeprefix("{").removesuffix("}").rstrip(":\n")
     try:
-        data = yaml.safe_load(response_text_copy)
+        data = _safe_load_yaml(response_text_copy)
         logging.info(f"Successfully parsed AI prediction after removing curly brackets")
         return data
     except:
@@ -108,7 +148,7 @@ def try_fix_yaml(response_text: str, keys_fix_yaml: List[str] = []) -> dict:
     for i in range(1, len(response_text_lines)):
         response_text_lines_tmp = "\n".join(response_text_lines[:-i])
         try:
-            data = yaml.safe_load(response_text_lines_tmp)
+            data = _safe_load_yaml(response_text_lines_tmp)
             if "language" in data:
                 logging.info(f"Successfully parsed AI prediction after removing {i} lines")
                 return data
@@ -131,7 +171,7 @@ def try_fix_yaml(response_text: str, keys_fix_yaml: List[str] = []) -> dict:
             index_end = len(response_text)  # response ends with valid yaml
         response_text_copy = response_text[index_start:index_end].strip()
         try:
-            data = yaml.safe_load(response_text_copy)
+            data = _safe_load_yaml(response_text_copy)
             logging.info(f"Successfully parsed AI prediction when using the language: key as a starting point")
             return data
         except:
@@ -152,12 +192,10 @@ def get_included_files(included_files: list, project_root: str = "", disable_tok
                     file_names_rel.append(file_path_rel)
             except IOError as e:
                 print(f"Error reading file {file_path}: {str(e)}")
-        out_str = ""
-        if included_files_content:
-            for i, content in enumerate(included_files_content):
-                out_str += f"file_path: `{file_names_rel[i]}`\ncontent:\n```\n{content}\n```\n\n\n"
-
-        out_str = out_str.strip()
+        out_str = "\n\n\n".join(
+            f"file_path: `{file_name}`\ncontent:\n```\n{content}\n```"
+            for file_name, content in zip(file_names_rel, included_files_content)
+        ).strip()
         if not disable_tokens and get_settings().get("include_files.limit_tokens", False):
             encoder = TokenEncoder.get_token_encoder()
             num_input_tokens = len(encoder.encode(out_str))
@@ -399,6 +437,73 @@ def find_test_files(args) -> list:
     return test_files
 
 
+@functools.lru_cache(maxsize=1)
+def get_extension_to_language_map() -> Dict[str, str]:
+    """
+    Build the file-extension to language mapping from settings.
+
+    The settings are a process-wide singleton, so the reverse mapping is built once
+    and shared by every generator and validator instance.
+
+    Returns:
+        dict: Mapping of file extensions (including the leading dot) to language names.
+    """
+    language_extension_map_org = get_settings().language_extension_map_org
+    return {
+        ext: language
+        for language, extensions in language_extension_map_org.items()
+        for ext in extensions
+    }
+
+
+_wandb_trace_executor: Optional[ThreadPoolExecutor] = None
+_wandb_trace_lock = threading.Lock()
+
+
+def log_wandb_trace(
+    name: str, inputs: Dict[str, Any], outputs: Dict[str, Any], logger: Optional[logging.Logger] = None
+) -> None:
+    """
+    Log an LLM trace span to Weights & Biases on a background thread.
+
+    Logging a span is a network round-trip, so it is kept off the caller's critical path.
+    Pending spans are flushed by flush_wandb_traces(), which also runs at interpreter exit.
+
+    Parameters:
+        name (str): The span name.
+        inputs (dict): The span inputs.
+        outputs (dict): The span outputs. Pass a copy if the caller keeps mutating it.
+        logger (logging.Logger, optional): Logger for logging failures. Defaults to the root logger.
+    """
+    global _wandb_trace_executor
+
+    def _log() -> None:
+        from wandb.sdk.data_types.trace_tree import Trace
+
+        try:
+            Trace(name=name, kind="llm", inputs=inputs, outputs=outputs).log(name="inference")
+        except Exception as e:
+            (logger or logging).error(f"Error logging to W&B: {e}")
+
+    with _wandb_trace_lock:
+        if _wandb_trace_executor is None:
+            _wandb_trace_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="wandb-trace")
+        _wandb_trace_executor.submit(_log)
+
+
+def flush_wandb_traces() -> None:
+    """Wait for every W&B trace span queued by log_wandb_trace() to be logged."""
+    global _wandb_trace_executor
+
+    with _wandb_trace_lock:
+        executor, _wandb_trace_executor = _wandb_trace_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+atexit.register(flush_wandb_traces)
+
+
 def get_original_caller() -> str:
     """
     Gets the name of the original calling function by traversing the call stack
@@ -1,3 +1,6 @@
+import textwrap
+
+
 def prepare_test_code_with_indentation(needed_indent:int, test_code: str) -> str:
         """
         Prepare test code with proper indentation.
@@ -12,11 +15,10 @@ def prepare_test_code_with_indentation(needed_indent:int, test_code: str) -> str
         needed_indent = needed_indent
         
         if needed_indent:
-            initial_indent = len(test_code) - len(test_code.lstrip())
+            # Leading blank lines are not indentation
+            initial_indent = len(test_code.lstrip("\n")) - len(test_code.lstrip())
             delta_indent = int(needed_indent) - initial_indent
             if delta_indent > 0:
-                test_code_indented = "\n".join(
-                    [delta_indent * " " + line for line in test_code.split("\n")]
-                )
+                test_code_indented = textwrap.indent(test_code, delta_indent * " ")
         
         return "\n" + test_code_indented.strip("\n") + "\n"
\ No newline at end of file
@@ -1,9 +1,30 @@
+from typing import FrozenSet, List, Optional, Tuple
+
+
+def split_original_content(original_content: str) -> Tuple[List[str], FrozenSet[str]]:
+        """
+        Split original content into lines and the set of its stripped lines.
+
+        The result can be passed to insert_test_code for every attempt on the same content,
+        so the content is only split and scanned once.
+
+        Parameters:
+            original_content (str): Original file content
+
+        Returns:
+            tuple: The content's lines and a frozenset of those lines stripped of whitespace
+        """
+        original_content_lines = original_content.split("\n")
+        return original_content_lines, frozenset(line.strip() for line in original_content_lines)
+
+
 def insert_test_code(
         original_content: str, 
         test_code_indented: str, 
         additional_imports: str, 
         import_index: int, 
-        test_index: int
+        test_index: int,
+        split_content: Optional[Tuple[List[str], FrozenSet[str]]] = None
     ) -> str:
         """
         Insert test code and imports into original content.
@@ -12,6 +33,7 @@ def insert_test_code(
             original_content (str): Original file content
             test_code_indented (str): Test code with indentation
             additional_imports (str): Import statements to add
+            split_content (tuple, optional): split_original_content(original_content), if already computed
             
         Returns:
             str: Processed test file content
@@ -20,26 +42,26 @@ def insert_test_code(
             return ""
             
         additional_imports_lines = []
-        original_content_lines = original_content.split("\n")
+        if split_content is None:
+            split_content = split_original_content(original_content)
+        # Copy the lines, since they are modified in place below
+        original_content_lines = list(split_content[0])
 
         # Process imports
         if additional_imports:
+            existing_lines = split_content[1]
             raw_import_lines = additional_imports.split("\n")
             for line in raw_import_lines:
-                if line.strip() and all(
-                    line.strip() != existing.strip() for existing in original_content_lines
-                ):
+                stripped_line = line.strip()
+                if stripped_line and stripped_line not in existing_lines:
                     additional_imports_lines.append(line)
 
         # Insert imports
+        # Lines are spliced in place so no intermediate lists are built
         inserted_lines_count = 0
         if import_index is not None and additional_imports_lines:
             inserted_lines_count = len(additional_imports_lines)
-            original_content_lines = (
-                original_content_lines[:import_index]
-                + additional_imports_lines
-                + original_content_lines[import_index:]
-            )
+            original_content_lines[import_index:import_index] = additional_imports_lines
 
         # Adjust test insertion point
         updated_test_insertion_point = test_index
@@ -48,10 +70,6 @@ def insert_test_code(
 
         # Insert test code
         test_code_lines = test_code_indented.split("\n")
-        processed_test_lines = (
-            original_content_lines[:updated_test_insertion_point]
-            + test_code_lines
-            + original_content_lines[updated_test_insertion_point:]
-        )
+        original_content_lines[updated_test_insertion_point:updated_test_insertion_point] = test_code_lines
         
-        return "\n".join(processed_test_lines)
\ No newline at end of file
+        return "\n".join(original_content_lines)
\ No newline at end of file
@@ -1,4 +1,3 @@
-import re
 def is_trivial_stub(test_code:str) -> bool:
     """
     Determine if the provided test code is a trivial stub.
@@ -13,22 +12,15 @@ def is_trivial_stub(test_code:str) -> bool:
     """
     if not test_code:
         return True
-    
-    code_lines =[
-        line.strip() for line in test_code.split('\n')
-        if line.strip() and not line.strip().startswith('#')
-    ]
-    
-    logic_lines = [
-        line for line in code_lines
-        if not line.startswith(('def','class','@'))
-    ]
-    
-    if not logic_lines:
-        return True
-    
-    if len(logic_lines) <= 2:
-        for line in logic_lines:
-            if line == 'pass':
-                return True
-    return False
\ No newline at end of file
+
+    # Single pass over the lines; scanning stops at the third logic line, since longer code is never a stub
+    logic_lines = []
+    for raw_line in test_code.split('\n'):
+        line = raw_line.strip()
+        if not line or line.startswith(('#', 'def', 'class', '@')):
+            continue
+        logic_lines.append(line)
+        if len(logic_lines) > 2:
+            return False
+
+    return not logic_lines or 'pass' in logic_lines
@@ -4,10 +4,17 @@ from app import app
 from datetime import date
 from unittest.mock import patch
 
-client = TestClient(app)
 
+@pytest.fixture(scope="session")
+def client():
+    """
+    Provide one TestClient for the whole session, so the app's startup and shutdown run once.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
 
-def test_root():
+
+def test_root(client):
     """
     Test the root endpoint by sending a GET request to "/" and checking the response status code and JSON body.
     """
@@ -16,178 +23,139 @@ def test_root():
     assert response.json() == {"message": "Welcome to the FastAPI application!"}
 
 
-def test_square():
+@pytest.mark.parametrize(
+    "number, expected",
+    [
+        pytest.param(5, 25, id="positive"),
+        pytest.param(-3, 9, id="negative"),
+        pytest.param(0, 0, id="zero"),
+    ],
+)
+def test_square(client, number, expected):
     """
     Test the square endpoint with various integer inputs.
     """
-    # Test positive number
-    response = client.get("/square/5")
-    assert response.status_code == 200
-    assert response.json() == {"result": 25}
-    
-    # Test negative number
-    response = client.get("/square/-3")
+    response = client.get(f"/square/{number}")
     assert response.status_code == 200
-    assert response.json() == {"result": 9}
-    
-    # Test zero
-    response = client.get("/square/0")
-    assert response.status_code == 200
-    assert response.json() == {"result": 0}
+    assert response.json() == {"result": expected}
 
 
-def test_is_palindrome():
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        pytest.param("racecar", True, id="palindrome"),
+        pytest.param("hello", False, id="non-palindrome"),
+        # The endpoint expects a path parameter, so a URL-encoded space stands in for an empty string
+        pytest.param("%20", True, id="empty"),
+        pytest.param("a", True, id="single-character"),
+        pytest.param("Racecar", False, id="case-sensitive"),
+    ],
+)
+def test_is_palindrome(client, text, expected):
     """
     Test the is_palindrome endpoint with various string inputs.
     """
-    # Test with palindrome
-    response = client.get("/is-palindrome/racecar")
-    assert response.status_code == 200
-    assert response.json() == {"is_palindrome": True}
-    
-    # Test with non-palindrome
-    response = client.get("/is-palindrome/hello")
-    assert response.status_code == 200
-    assert response.json() == {"is_palindrome": False}
-    
-    # Test with empty string (empty string is a palindrome)
-    # The endpoint expects a path parameter, so we need to provide an empty string as the parameter
-    response = client.get("/is-palindrome/%20")  # URL-encoded space to represent empty string
-    assert response.status_code == 200
-    assert response.json() == {"is_palindrome": True}
-    
-    # Test with single character
-    response = client.get("/is-palindrome/a")
+    response = client.get(f"/is-palindrome/{text}")
     assert response.status_code == 200
-    assert response.json() == {"is_palindrome": True}
-    
-    # Test with case-sensitive palindrome
-    response = client.get("/is-palindrome/Racecar")
-    assert response.status_code == 200
-    assert response.json() == {"is_palindrome": False}
+    assert response.json() == {"is_palindrome": expected}
 
 
-def test_sqrt_endpoint():
+@pytest.mark.parametrize(
+    "number, status_code, body",
+    [
+        pytest.param("16", 200, {"result": 4.0}, id="positive"),
+        pytest.param("0", 200, {"result": 0.0}, id="zero"),
+        pytest.param(
+            "-4", 400, {"detail": "Cannot take square root of a negative number"}, id="negative"
+        ),
+        pytest.param("2.25", 200, {"result": 1.5}, id="decimal"),
+    ],
+)
+def test_sqrt_endpoint(client, number, status_code, body):
     """
     Test the sqrt endpoint with various inputs including valid and invalid cases.
     """
-    # Test with positive number
-    response = client.get("/sqrt/16")
-    assert response.status_code == 200
-    assert response.json() == {"result": 4.0}
-    
-    # Test with zero
-    response = client.get("/sqrt/0")
-    assert response.status_code == 200
-    assert response.json() == {"result": 0.0}
-    
-    # Test with negative number (should raise HTTPException)
-    response = client.get("/sqrt/-4")
-    assert response.status_code == 400
-    assert response.json() == {"detail": "Cannot take square root of a negative number"}
-    
-    # Test with decimal number
-    response = client.get("/sqrt/2.25")
-    assert response.status_code == 200
-    assert response.json() == {"result": 1.5}
+    response = client.get(f"/sqrt/{number}")
+    assert response.status_code == status_code
+    assert response.json() == body
 
 
-def test_divide_by_zero():
+@pytest.mark.parametrize(
+    "num1, num2",
+    [
+        pytest.param(10, 0, id="non-zero-numerator"),
+        pytest.param(0, 0, id="zero-numerator"),
+    ],
+)
+def test_divide_by_zero(client, num1, num2):
     """
     Test the divide endpoint with zero denominator to ensure proper error handling.
     """
-    response = client.get("/divide/10/0")
-    assert response.status_code == 400
-    assert response.json() == {"detail": "Cannot divide by zero"}
-    
-    response = client.get("/divide/0/0")
+    response = client.get(f"/divide/{num1}/{num2}")
     assert response.status_code == 400
     assert response.json() == {"detail": "Cannot divide by zero"}
 
 
-def test_divide_valid():
+@pytest.mark.parametrize(
+    "num1, num2, expected",
+    [
+        pytest.param(10, 2, 5.0, id="whole-result"),
+        pytest.param(5, 2, 2.5, id="float-result"),
+        pytest.param(0, 5, 0.0, id="zero-numerator"),
+        pytest.param(-10, 2, -5.0, id="negative"),
+    ],
+)
+def test_divide_valid(client, num1, num2, expected):
     """
     Test the divide endpoint with valid integer inputs.
     """
-    response = client.get("/divide/10/2")
+    response = client.get(f"/divide/{num1}/{num2}")
     assert response.status_code == 200
-    assert response.json() == {"result": 5.0}
-    
-    response = client.get("/divide/0/5")
-    assert response.status_code == 200
-    assert response.json() == {"result": 0.0}
-    
-    response = client.get("/divide/-10/2")
-    assert response.status_code == 200
-    assert response.json() == {"result": -5.0}
+    assert response.json() == {"result": expected}
 
 
-def test_divide():
-    """
-    Test the divide endpoint with valid division and division by zero error.
-    """
-    # Test valid division
-    response = client.get("/divide/10/2")
-    assert response.status_code == 200
-    assert response.json() == {"result": 5.0}
-    
-    # Test division resulting in float
-    response = client.get("/divide/5/2")
-    assert response.status_code == 200
-    assert response.json() == {"result": 2.5}
-    
-    # Test division by zero raises HTTPException
-    response = client.get("/divide/10/0")
-    assert response.status_code == 400
-    assert response.json() == {"detail": "Cannot divide by zero"}
-
-
-def test_subtract():
+@pytest.mark.parametrize(
+    "num1, num2, expected",
+    [
+        pytest.param(10, 4, 6, id="positive"),
+        pytest.param(3, 10, -7, id="negative-result"),
+        pytest.param(-5, -3, -2, id="negative-numbers"),
+    ],
+)
+def test_subtract(client, num1, num2, expected):
     """
     Test the subtract endpoint with various integer combinations.
     """
-    # Test positive numbers
-    response = client.get("/subtract/10/4")
-    assert response.status_code == 200
-    assert response.json() == {"result": 6}
-    
-    # Test negative result
-    response = client.get("/subtract/3/10")
-    assert response.status_code == 200
-    assert response.json() == {"result": -7}
-    
-    # Test with negative numbers
-    response = client.get("/subtract/-5/-3")
+    response = client.get(f"/subtract/{num1}/{num2}")
     assert response.status_code == 200
-    assert response.json() == {"result": -2}
+    assert response.json() == {"result": expected}
 
 
-def test_add():
+@pytest.mark.parametrize(
+    "num1, num2, expected",
+    [
+        pytest.param(5, 3, 8, id="positive"),
+        pytest.param(-5, 3, -2, id="negative"),
+        pytest.param(0, 0, 0, id="zero"),
+    ],
+)
+def test_add(client, num1, num2, expected):
     """
     Test the add endpoint with various integer combinations.
     """
-    # Test positive numbers
-    response = client.get("/add/5/3")
+    response = client.get(f"/add/{num1}/{num2}")
     assert response.status_code == 200
-    assert response.json() == {"result": 8}
-    
-    # Test negative numbers
-    response = client.get("/add/-5/3")
-    assert response.status_code == 200
-    assert response.json() == {"result": -2}
-    
-    # Test zero
-    response = client.get("/add/0/0")
-    assert response.status_code == 200
-    assert response.json() == {"result": 0}
+    assert response.json() == {"result": expected}
 
 
-def test_current_date():
+def test_current_date(client):
     """
     Test the current_date endpoint by sending a GET request to "/current-date"
     and checking the response contains today's date in ISO format.
+    The date is frozen so the test cannot fail when run across midnight.
     """
-    response = client.get("/current-date")
+    with patch("app.date") as mock_date:
+        mock_date.today.return_value = date(2024, 1, 1)
+        response = client.get("/current-date")
     assert response.status_code == 200
-    assert response.json() == {"date": date.today().isoformat()}
-
+    assert response.json() == {"date": "2024-01-01"}
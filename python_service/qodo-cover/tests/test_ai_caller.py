@@ -5,6 +5,7 @@ from unittest.mock import Mock, patch
 import pytest
 
 from cover_agent.ai_caller import AICaller
+from cover_agent.utils import flush_wandb_traces
 
 
 class TestAICaller:
@@ -73,7 +74,7 @@ class TestAICaller:
 
     @patch("cover_agent.ai_caller.litellm.completion")
     @patch.dict(os.environ, {"WANDB_API_KEY": "test_key"})
-    @patch("cover_agent.ai_caller.Trace.log")
+    @patch("wandb.sdk.data_types.trace_tree.Trace.log")
     def test_call_model_wandb_logging(self, mock_log, mock_completion, ai_caller):
         """
         Test the call_model method with W&B logging enabled.
@@ -89,6 +90,7 @@ class TestAICaller:
             assert response == "response"
             assert prompt_tokens == 2
             assert response_tokens == 10
+            flush_wandb_traces()
             mock_log.assert_called_once()
 
     @patch("cover_agent.ai_caller.litellm.completion")
@@ -175,7 +177,7 @@ class TestAICaller:
 
     @patch("cover_agent.ai_caller.litellm.completion")
     @patch.dict(os.environ, {"WANDB_API_KEY": "test_key"})
-    @patch("cover_agent.ai_caller.Trace.log")
+    @patch("wandb.sdk.data_types.trace_tree.Trace.log")
     def test_call_model_wandb_logging_exception(self, mock_log, mock_completion, ai_caller):
         """
         Test the call_model method with W&B logging and handle logging exceptions.
@@ -201,4 +203,53 @@ class TestAICaller:
             assert response == "response"
             assert prompt_tokens == 2
             assert response_tokens == 10
+            flush_wandb_traces()
             mock_logger.assert_called_once_with("Error logging to W&B: Logging error")
+
+    @patch("cover_agent.ai_caller.litellm.completion")
+    def test_call_model_anthropic_prompt_caching(self, mock_completion):
+        """
+        Test that Anthropic models get a cache breakpoint after the stable user prompt prefix and that
+        cached prompt tokens are tracked.
+        """
+        ai_caller = AICaller(model="anthropic/claude-3-5-sonnet", api_base="test-api", enable_retry=False)
+        mock_chunk = Mock()
+        mock_chunk.choices = [Mock(delta=Mock(content="response"))]
+        mock_completion.return_value = [mock_chunk]
+        prompt = {"system": "System message", "user": "Source code\nFailing test"}
+
+        with patch("cover_agent.ai_caller.litellm.stream_chunk_builder") as mock_builder:
+            mock_builder.return_value = {
+                "choices": [{"message": {"content": "response"}}],
+                "usage": {"prompt_tokens": 20, "completion_tokens": 10, "cache_read_input_tokens": 15},
+            }
+            ai_caller.call_model(prompt, cacheable_prefix="Source code\n")
+
+        system_message, user_message = mock_completion.call_args[1]["messages"]
+        assert system_message == {"role": "system", "content": "System message"}
+        assert user_message["content"] == [
+            {"type": "text", "text": "Source code\n", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "Failing test"},
+        ]
+        assert ai_caller.total_cached_prompt_tokens == 15
+
+    @patch("cover_agent.ai_caller.litellm.completion")
+    def test_call_model_openai_cached_tokens(self, mock_completion, ai_caller):
+        """
+        Test that non-Anthropic models keep a plain system string and report OpenAI-style cached tokens.
+        """
+        mock_chunk = Mock()
+        mock_chunk.choices = [Mock(delta=Mock(content="response"))]
+        mock_completion.return_value = [mock_chunk]
+        prompt = {"system": "System message", "user": "Hello, world!"}
+
+        with patch("cover_agent.ai_caller.litellm.stream_chunk_builder") as mock_builder:
+            mock_builder.return_value = {
+                "choices": [{"message": {"content": "response"}}],
+                "usage": {"prompt_tokens": 20, "completion_tokens": 10, "prompt_tokens_details": {"cached_tokens": 8}},
+            }
+            ai_caller.call_model(prompt)
+
+        assert mock_completion.call_args[1]["messages"][0]["content"] == "System message"
+        assert mock_completion.call_args[1]["messages"][1]["content"] == "Hello, world!"
+        assert ai_caller.total_cached_prompt_tokens == 8
@@ -40,6 +40,52 @@ class TestDefaultAgentCompletion:
             mock_build_prompt.assert_called_once()
             mock_caller.call_model.assert_called_once()
 
+    def test_fix_test_marks_source_prefix_cacheable(self):
+        """
+        Test that fix_test passes the user prompt up to the source file as the cacheable prefix,
+        since that part stays the same across fix attempts.
+        """
+        mock_caller = MagicMock()
+        mock_caller.call_model.return_value = ("fixed test", 100, 50)
+        agent = DefaultAgentCompletion(caller=mock_caller)
+
+        result = agent.fix_test(
+            source_file_name="app.py",
+            source_file="def add(a, b):\n    return a + b",
+            test_code="def test_add():\n    assert add(1, 2) == 4",
+            error_message="AssertionError",
+            language="python",
+            test_file_name="test_app.py",
+        )
+
+        user_prompt = result[3]
+        cacheable_prefix = mock_caller.call_model.call_args.kwargs["cacheable_prefix"]
+        assert result[:3] == ("fixed test", 100, 50)
+        assert user_prompt.startswith(cacheable_prefix)
+        assert cacheable_prefix.endswith("def add(a, b):\n    return a + b")
+        assert "AssertionError" not in cacheable_prefix
+
+    def test_fix_test_cacheable_prefix_ignores_earlier_source_text(self):
+        """
+        Test that the cacheable prefix ends at the source file block even when the source text also
+        appears earlier in the rendered prompt.
+        """
+        mock_caller = MagicMock()
+        mock_caller.call_model.return_value = ("fixed test", 100, 50)
+        agent = DefaultAgentCompletion(caller=mock_caller)
+
+        agent.fix_test(
+            source_file_name="app.py",
+            source_file="python",
+            test_code="def test_app():\n    assert True",
+            error_message="AssertionError",
+            language="python",
+            test_file_name="test_app.py",
+        )
+
+        cacheable_prefix = mock_caller.call_model.call_args.kwargs["cacheable_prefix"]
+        assert cacheable_prefix.endswith("```python\npython")
+
     def test_adapt_test_command_success(self):
         """
         Test the adapt_test_command_for_a_single_test_via_ai method to ensure it correctly
@@ -1,8 +1,6 @@
 import tempfile
 import textwrap
 
-import pytest
-
 from cover_agent.file_preprocessor import FilePreprocessor
 
 
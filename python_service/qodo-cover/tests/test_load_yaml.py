@@ -2,13 +2,15 @@
 import os
 import sys
 
+from unittest.mock import patch
+
 import pytest
 import yaml
 
 from yaml.scanner import ScannerError
 
 from cover_agent.settings.config_loader import get_settings
-from cover_agent.utils import load_yaml, parse_args_full_repo
+from cover_agent.utils import _safe_load_yaml, load_yaml, parse_args_full_repo
 
 
 class TestLoadYaml:
@@ -24,6 +26,27 @@ class TestLoadYaml:
         expected_output = {"name": "John Smith", "age": 35}
         assert load_yaml(yaml_str) == expected_output
 
+    def test_load_yaml_repeated_response_returns_independent_copies(self):
+        """
+        Tests that parsing the same response twice returns equal but independent results.
+        """
+        yaml_str = "test_code: |\n  assert True\ntags:\n  - a"
+        first = load_yaml(yaml_str)
+        first["tags"].append("b")
+        second = load_yaml(yaml_str)
+        assert second == {"test_code": "assert True\n", "tags": ["a"]}
+
+    def test_safe_load_yaml_remembers_parse_failures(self):
+        """
+        Tests that a text which failed to parse is not parsed again on the next attempt.
+        """
+        yaml_str = "remembered_failure: [unclosed_list"
+        with patch("cover_agent.utils.yaml.load", wraps=yaml.load) as mock_load:
+            for _ in range(2):
+                with pytest.raises(yaml.YAMLError):
+                    _safe_load_yaml(yaml_str)
+        mock_load.assert_called_once()
+
     def test_load_invalid_yaml1(self):
         """
         Tests that load_yaml raises a ScannerError for invalid YAML input.
@@ -168,8 +191,6 @@ hope this helps!
         """
         Tests that load_yaml returns None for invalid YAML input.
         """
-        from cover_agent.utils import try_fix_yaml
-
         yaml_str = """
 here is the response
 
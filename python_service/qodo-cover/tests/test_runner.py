@@ -1,5 +1,3 @@
-import pytest
-
 from cover_agent.runner import Runner
 
 
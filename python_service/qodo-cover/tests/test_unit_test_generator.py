@@ -2,8 +2,6 @@ import tempfile
 
 from unittest.mock import MagicMock, mock_open, patch
 
-import pytest
-
 import cover_agent.utils
 
 from cover_agent.unit_test_generator import UnitTestGenerator
@@ -1,11 +1,10 @@
 import datetime
+import json
 import os
 import tempfile
 
 from unittest.mock import MagicMock, mock_open, patch
 
-import pytest
-
 from cover_agent.coverage_processor import CoverageProcessor
 from cover_agent.runner import Runner
 from cover_agent.settings.config_schema import CoverageType
@@ -113,6 +112,44 @@ class TestUnitValidator:
                     # Dividing by zero so we're expecting a logged error and a return of 0
                     assert generator.current_coverage == 0
 
+    def test_run_coverage_unparsable_report_keeps_head_and_tail(self, tmp_path):
+        """
+        Test that `run_coverage` falls back to the raw coverage report when it cannot be parsed,
+        keeping only the head and tail of a report larger than `MAX_RAW_COVERAGE_REPORT_BYTES`.
+        """
+        source_file = tmp_path / "source.py"
+        source_file.write_text("print('source')")
+        report_file = tmp_path / "coverage.xml"
+        report_file.write_text("HEAD" + "x" * 100 + "TAIL")
+
+        generator = UnitTestValidator(
+            source_file_path=str(source_file),
+            test_file_path="test_test.py",
+            code_coverage_report_path=str(report_file),
+            test_command="pytest",
+            test_command_dir=str(tmp_path),
+            llm_model="gpt-3",
+            agent_completion=MagicMock(),
+            max_run_time_sec=30,
+            desired_coverage=90,
+            comparison_branch="main",
+            coverage_type=CoverageType.COBERTURA,
+            diff_coverage=False,
+            num_attempts=1,
+            additional_instructions="",
+            included_files=[],
+            use_report_coverage_feature_flag=False,
+        )
+        generator.MAX_RAW_COVERAGE_REPORT_BYTES = 8
+
+        with (
+            patch.object(Runner, "run_command", return_value=("", "", 0, datetime.datetime.now())),
+            patch.object(generator, "post_process_coverage_report", side_effect=ValueError("unsupported")),
+        ):
+            generator.run_coverage()
+
+        assert generator.code_coverage_report == "HEAD\n... [100 bytes omitted] ...\nTAIL"
+
     def test_extract_error_message_with_prompt_builder(self):
         """
         Test the `extract_error_message` method of the `UnitTestValidator` class with a prompt builder.
@@ -180,6 +217,64 @@ class TestUnitValidator:
             assert fail_details["source_file_name"] in mock_agent_completion_call_args["source_file_name"]
             assert fail_details["source_file"] == mock_agent_completion_call_args["source_file"]
 
+            # An identical failure reuses the earlier analysis
+            assert generator.extract_error_message(dict(fail_details)) == error_message
+            assert mock_agent_completion.analyze_test_failure.call_count == 1
+
+    def test_extract_error_message_load_error_skips_ai(self):
+        """
+        Test that `extract_error_message` summarizes a test file that failed to load with
+        its own error line, without an AI call.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".py", delete=False) as temp_source_file:
+            mock_agent_completion = MagicMock()
+            generator = UnitTestValidator(
+                source_file_path=temp_source_file.name,
+                test_file_path="test_test.py",
+                code_coverage_report_path="coverage.xml",
+                test_command="pytest",
+                test_command_dir=os.getcwd(),
+                llm_model="gpt-3",
+                agent_completion=mock_agent_completion,
+                max_run_time_sec=30,
+                desired_coverage=90,
+                comparison_branch="main",
+                coverage_type=CoverageType.COBERTURA,
+                diff_coverage=False,
+                num_attempts=1,
+                additional_instructions="",
+                included_files=[],
+                use_report_coverage_feature_flag=False,
+            )
+
+            # Output of a real pytest run on a test file importing a missing module
+            pytest_output = (
+                "==================================== ERRORS ====================================\n"
+                "__________________________ ERROR collecting test_x.py __________________________\n"
+                "ImportError while importing test module '/tmp/colltest/test_x.py'.\n"
+                "Hint: make sure your test modules/packages have valid Python names.\n"
+                "Traceback:\n"
+                "/root/.pyenv/versions/3.11.7/lib/python3.11/importlib/__init__.py:126: in import_module\n"
+                "    return _bootstrap._gcd_import(name[level:], package, level)\n"
+                "           ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^\n"
+                "test_x.py:1: in <module>\n"
+                "    import missing_mod\n"
+                "E   ModuleNotFoundError: No module named 'missing_mod'\n"
+                "=========================== short test summary info ============================\n"
+                "ERROR test_x.py\n"
+                "!!!!!!!!!!!!!!!!!!!! Interrupted: 1 error during collection !!!!!!!!!!!!!!!!!!!!\n"
+                "1 error in 0.12s\n"
+            )
+            fail_details = {
+                "stderr": "",
+                "stdout": pytest_output,
+                "processed_test_file": "",
+            }
+            error_message = generator.extract_error_message(fail_details)
+
+            assert error_message == "ModuleNotFoundError: No module named 'missing_mod'"
+            mock_agent_completion.analyze_test_failure.assert_not_called()
+
     def test_validate_test_pass_no_coverage_increase_with_prompt(self):
         """
         Test the `validate_test` method of the `UnitTestValidator` class when the test passes
@@ -541,3 +636,444 @@ class TestUnitValidator:
             ):
                 generator.generate_diff_coverage_report()
                 mock_logger_error.assert_called_once_with("Error running diff-cover: Mock exception")
+
+    def test_get_included_files_preserves_order_and_skips_unreadable(self, tmp_path):
+        """
+        Test the `get_included_files` static method of the `UnitTestValidator` class.
+
+        This test ensures that included files are concatenated in the order they were
+        given, and that files which cannot be read are skipped without failing.
+        """
+        first_file = tmp_path / "first.py"
+        first_file.write_text("print('first')")
+        second_file = tmp_path / "second.py"
+        second_file.write_text("print('second')")
+        missing_file = tmp_path / "missing.py"
+
+        result = UnitTestValidator.get_included_files([str(first_file), str(missing_file), str(second_file)])
+
+        assert result == (
+            f"file_path: `{first_file}`\ncontent:\n```\nprint('first')\n```\n"
+            f"file_path: `{second_file}`\ncontent:\n```\nprint('second')\n```"
+        )
+        assert UnitTestValidator.get_included_files([]) == ""
+
+    def test_read_file_cache_invalidated_on_change(self, tmp_path):
+        """
+        Test that `_read_file` and `_create_numbered_file_content` reuse cached content
+        while a file is unchanged and pick up new content once the file is modified.
+        """
+        source_file = tmp_path / "source.py"
+        source_file.write_text("print('source')")
+        test_file = tmp_path / "test_source.py"
+        test_file.write_text("line one\nline two")
+
+        generator = UnitTestValidator(
+            source_file_path=str(source_file),
+            test_file_path=str(test_file),
+            code_coverage_report_path="coverage.xml",
+            test_command="pytest",
+            test_command_dir=str(tmp_path),
+            llm_model="gpt-3",
+            agent_completion=MagicMock(),
+            max_run_time_sec=30,
+            desired_coverage=90,
+            comparison_branch="main",
+            coverage_type=CoverageType.COBERTURA,
+            diff_coverage=False,
+            num_attempts=1,
+            additional_instructions="",
+            included_files=[],
+            use_report_coverage_feature_flag=False,
+        )
+
+        first_read = generator._read_file(str(test_file))
+        assert generator._read_file(str(test_file)) is first_read
+        assert generator._create_numbered_file_content(str(test_file)) == "1 line one\n2 line two"
+
+        test_file.write_text("line one\nline two\nline three")
+        os.utime(test_file, ns=(0, 0))
+
+        assert generator._read_file(str(test_file)) == "line one\nline two\nline three"
+        assert generator._create_numbered_file_content(str(test_file)) == "1 line one\n2 line two\n3 line three"
+
+        # Line endings are normalized as in text mode
+        test_file.write_bytes(b"line one\r\nline two\rline three\n")
+        assert generator._read_file(str(test_file)) == "line one\nline two\nline three\n"
+
+    def test_restore_test_file_restores_in_place(self, tmp_path):
+        """
+        Test that `_restore_test_file` restores the original content through a symlinked test file,
+        preserves the file mode, leaves no extra files behind and skips the write when nothing changed.
+        """
+        source_file = tmp_path / "source.py"
+        source_file.write_text("print('source')")
+        real_test_file = tmp_path / "real_test_source.py"
+        real_test_file.write_text("candidate test")
+        os.chmod(real_test_file, 0o644)
+        test_file = tmp_path / "test_source.py"
+        test_file.symlink_to(real_test_file)
+
+        generator = UnitTestValidator(
+            source_file_path=str(source_file),
+            test_file_path=str(test_file),
+            code_coverage_report_path="coverage.xml",
+            test_command="pytest",
+            test_command_dir=str(tmp_path),
+            llm_model="gpt-3",
+            agent_completion=MagicMock(),
+            max_run_time_sec=30,
+            desired_coverage=90,
+            comparison_branch="main",
+            coverage_type=CoverageType.COBERTURA,
+            diff_coverage=False,
+            num_attempts=1,
+            additional_instructions="",
+            included_files=[],
+            use_report_coverage_feature_flag=False,
+        )
+        generator._restore_test_file("original test")
+
+        assert test_file.is_symlink()
+        assert real_test_file.read_text() == "original test"
+        assert os.stat(real_test_file).st_mode & 0o777 == 0o644
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "real_test_source.py", "source.py", "test_source.py"
+        ]
+
+        # The file already holds the original content, so a second rollback does not rewrite it
+        with patch("builtins.open") as mock_file_open:
+            generator._restore_test_file("original test")
+            mock_file_open.assert_not_called()
+
+    def test_source_code_read_on_first_access(self, tmp_path):
+        """
+        Test that the source file is not read during construction and is read once on first access.
+        """
+        source_file = tmp_path / "source.py"
+        source_file.write_text("print('source')")
+        test_file = tmp_path / "test_source.py"
+        test_file.write_text("")
+
+        generator = UnitTestValidator(
+            source_file_path=str(source_file),
+            test_file_path=str(test_file),
+            code_coverage_report_path="coverage.xml",
+            test_command="pytest",
+            test_command_dir=str(tmp_path),
+            llm_model="gpt-3",
+            agent_completion=MagicMock(),
+            max_run_time_sec=30,
+            desired_coverage=90,
+            comparison_branch="main",
+            coverage_type=CoverageType.COBERTURA,
+            diff_coverage=False,
+            num_attempts=1,
+            additional_instructions="",
+            included_files=[],
+            use_report_coverage_feature_flag=False,
+        )
+        assert "source_code" not in vars(generator)
+
+        source_file.write_text("print('updated')")
+        assert generator.source_code == "print('updated')"
+
+        source_file.write_text("print('ignored')")
+        assert generator.source_code == "print('updated')"
+
+    def test_run_test_with_retry_parallel_flakiness_checks(self):
+        """
+        Test that `_run_test_with_retry` dispatches the extra flakiness checks concurrently when
+        enabled, returns the first failing run, and otherwise finishes with a single final run.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".py", delete=False) as temp_source_file:
+            generator = UnitTestValidator(
+                source_file_path=temp_source_file.name,
+                test_file_path="test_test.py",
+                code_coverage_report_path="coverage.xml",
+                test_command="pytest",
+                test_command_dir=os.getcwd(),
+                llm_model="gpt-3",
+                agent_completion=MagicMock(),
+                max_run_time_sec=30,
+                desired_coverage=90,
+                comparison_branch="main",
+                coverage_type=CoverageType.COBERTURA,
+                diff_coverage=False,
+                num_attempts=3,
+                additional_instructions="",
+                included_files=[],
+                use_report_coverage_feature_flag=False,
+            )
+
+            with patch("cover_agent.unit_test_validator.get_settings") as mock_get_settings:
+                mock_get_settings.return_value.get.return_value.get.return_value = True
+
+                with patch.object(Runner, "run_command", return_value=("ok", "", 0, 123)) as mock_run:
+                    assert generator._run_test_with_retry(0) == ("ok", "", 0, 123)
+                    assert mock_run.call_count == 3
+
+                with patch.object(
+                    Runner, "run_command", side_effect=[("ok", "", 0, 1), ("", "boom", 1, 2)]
+                ) as mock_run:
+                    assert generator._run_test_with_retry(0) == ("", "boom", 1, 2)
+                    assert mock_run.call_count == 2
+
+    def test_run_test_with_retry_keeps_output_tail(self):
+        """
+        Test that `_run_test_with_retry` keeps only the tail of very long stdout/stderr output.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".py", delete=False) as temp_source_file:
+            generator = UnitTestValidator(
+                source_file_path=temp_source_file.name,
+                test_file_path="test_test.py",
+                code_coverage_report_path="coverage.xml",
+                test_command="pytest",
+                test_command_dir=os.getcwd(),
+                llm_model="gpt-3",
+                agent_completion=MagicMock(),
+                max_run_time_sec=30,
+                desired_coverage=90,
+                comparison_branch="main",
+                coverage_type=CoverageType.COBERTURA,
+                diff_coverage=False,
+                num_attempts=1,
+                additional_instructions="",
+                included_files=[],
+                use_report_coverage_feature_flag=False,
+            )
+            generator.MAX_TEST_OUTPUT_CHARS = 5
+
+            with patch.object(Runner, "run_command", return_value=("collected 1 item", "AssertionError", 1, 123)):
+                assert generator._run_test_with_retry(0) == (" item", "Error", 1, 123)
+
+    def test_fix_test_for_coverage_skips_repeated_fix_request(self, tmp_path):
+        """
+        Test that `_fix_test_for_coverage` does not send the same fix request to the AI twice.
+        """
+        source_file = tmp_path / "source.py"
+        source_file.write_text("def add(a, b):\n    return a + b")
+        test_file = tmp_path / "test_source.py"
+        test_file.write_text("")
+
+        mock_agent_completion = MagicMock()
+        mock_agent_completion.fix_test.return_value = (
+            "test_code: |\n  def test_add():\n      assert add(1, 2) == 3\n",
+            10,
+            10,
+            "test prompt",
+        )
+        generator = UnitTestValidator(
+            source_file_path=str(source_file),
+            test_file_path=str(test_file),
+            code_coverage_report_path="coverage.xml",
+            test_command="pytest",
+            test_command_dir=str(tmp_path),
+            llm_model="gpt-3",
+            agent_completion=mock_agent_completion,
+            max_run_time_sec=30,
+            desired_coverage=90,
+            comparison_branch="main",
+            coverage_type=CoverageType.COBERTURA,
+            diff_coverage=False,
+            num_attempts=1,
+            additional_instructions="",
+            included_files=[],
+            use_report_coverage_feature_flag=False,
+        )
+        generator.current_coverage = 0.5
+        generated_test = {"test_behavior": "adds numbers", "lines_to_cover": "[2]"}
+        current_test_code = "def test_add():\n    assert add(1, 1) == 2"
+
+        new_test_code = generator._fix_test_for_coverage(generated_test, current_test_code, {current_test_code}, 0.5)
+        assert new_test_code == "def test_add():\n    assert add(1, 2) == 3"
+
+        assert generator._fix_test_for_coverage(generated_test, current_test_code, {current_test_code}, 0.5) is None
+        mock_agent_completion.fix_test.assert_called_once()
+
+    def test_call_ai_fix_plain_code_response_skips_yaml_parse(self, tmp_path):
+        """
+        Test that `_call_ai_fix` returns a response without a `test_code` key as is, without parsing it,
+        and still extracts `test_code` from a YAML response.
+        """
+        source_file = tmp_path / "source.py"
+        source_file.write_text("def add(a, b):\n    return a + b")
+
+        mock_agent_completion = MagicMock()
+        generator = UnitTestValidator(
+            source_file_path=str(source_file),
+            test_file_path="test_source.py",
+            code_coverage_report_path="coverage.xml",
+            test_command="pytest",
+            test_command_dir=str(tmp_path),
+            llm_model="gpt-3",
+            agent_completion=mock_agent_completion,
+            max_run_time_sec=30,
+            desired_coverage=90,
+            comparison_branch="main",
+            coverage_type=CoverageType.COBERTURA,
+            diff_coverage=False,
+            num_attempts=1,
+            additional_instructions="",
+            included_files=[],
+            use_report_coverage_feature_flag=False,
+        )
+        generated_test = {"test_behavior": "adds numbers", "lines_to_cover": "[2]"}
+        plain_code = "def test_add():\n    assert add(1, 2) == 3"
+
+        mock_agent_completion.fix_test.return_value = (plain_code, 10, 10, "test prompt")
+        with patch("cover_agent.unit_test_validator.load_yaml") as mock_load_yaml:
+            assert generator._call_ai_fix(generated_test, "", "", "", "") == plain_code
+            mock_load_yaml.assert_not_called()
+
+        mock_agent_completion.fix_test.return_value = ("test_code: |\n  " + plain_code.replace("\n", "\n  "), 10, 10, "")
+        assert generator._call_ai_fix(generated_test, "", "", "", "") == plain_code
+
+    def test_handle_test_failure_analyzes_failure_in_background(self, tmp_path):
+        """
+        Test that `_handle_test_failure` records the failed run right away and fills in its
+        error message once the background failure analysis has been waited for.
+        """
+        source_file = tmp_path / "source.py"
+        source_file.write_text("print('source')")
+        test_file = tmp_path / "test_source.py"
+        test_file.write_text("candidate test")
+
+        generator = UnitTestValidator(
+            source_file_path=str(source_file),
+            test_file_path=str(test_file),
+            code_coverage_report_path="coverage.xml",
+            test_command="pytest",
+            test_command_dir=str(tmp_path),
+            llm_model="gpt-3",
+            agent_completion=MagicMock(),
+            max_run_time_sec=30,
+            desired_coverage=90,
+            comparison_branch="main",
+            coverage_type=CoverageType.COBERTURA,
+            diff_coverage=False,
+            num_attempts=1,
+            additional_instructions="",
+            included_files=[],
+            use_report_coverage_feature_flag=False,
+        )
+        generated_test = {"test_code": "def test_x(): assert False"}
+
+        with patch.object(generator, "extract_error_message", return_value="assertion failed") as mock_extract:
+            fail_details = generator._handle_test_failure(
+                "original test", generated_test, "processed test", 1, "", "AssertionError", {"t"}
+            )
+            generator.wait_for_failure_analyses()
+
+        assert fail_details["status"] == "FAIL"
+        assert test_file.read_text() == "original test"
+        mock_extract.assert_called_once()
+        assert generator.failed_test_runs == [{"code": generated_test, "error_message": "assertion failed"}]
+        assert generator._failure_analysis_executor is None
+
+    def test_to_json_round_trips_to_dict(self):
+        """
+        Test that `to_json` produces indented JSON matching `to_dict`, with enums serialized by value.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".py", delete=False) as temp_source_file:
+            generator = UnitTestValidator(
+                source_file_path=temp_source_file.name,
+                test_file_path="test_test.py",
+                code_coverage_report_path="coverage.xml",
+                test_command="pytest",
+                test_command_dir=os.getcwd(),
+                llm_model="gpt-3",
+                agent_completion=MagicMock(),
+                max_run_time_sec=30,
+                desired_coverage=90,
+                comparison_branch="main",
+                coverage_type=CoverageType.COBERTURA,
+                diff_coverage=False,
+                num_attempts=1,
+                additional_instructions="",
+                included_files=[],
+                use_report_coverage_feature_flag=False,
+            )
+
+            expected = {**generator.to_dict(), "coverage_type": "cobertura"}
+
+            json_str = generator.to_json()
+            assert json_str.startswith('{\n  "source_file_path"')
+            assert json.loads(json_str) == expected
+
+    def test_log_coverage_improvements_logs_only_increased_files(self, tmp_path):
+        """
+        Test that `_log_coverage_improvements` logs only files present in both reports whose
+        coverage increased, in report order.
+        """
+        source_file = tmp_path / "source.py"
+        source_file.write_text("print('source')")
+
+        generator = UnitTestValidator(
+            source_file_path=str(source_file),
+            test_file_path="test_test.py",
+            code_coverage_report_path="coverage.xml",
+            test_command="pytest",
+            test_command_dir=str(tmp_path),
+            llm_model="gpt-3",
+            agent_completion=MagicMock(),
+            max_run_time_sec=30,
+            desired_coverage=90,
+            comparison_branch="main",
+            coverage_type=CoverageType.COBERTURA,
+            diff_coverage=False,
+            num_attempts=1,
+            additional_instructions="",
+            included_files=[],
+            use_report_coverage_feature_flag=False,
+        )
+        generator.last_coverage_percentages = {"source.py": 0.5, "other.py": 0.2, "same.py": 0.3}
+
+        with patch.object(generator.logger, "info") as mock_info:
+            generator._log_coverage_improvements(
+                {"other.py": 0.4, "same.py": 0.3, "new.py": 0.9, "source.py": 0.75}
+            )
+
+        assert [call.args[0] for call in mock_info.call_args_list] == [
+            "Coverage for non-source file: other.py increased from 20.0 to 40.0",
+            "Coverage for provided source file: source.py increased from 50.0 to 75.0",
+        ]
+
+    def test_process_full_report_coverage_totals(self, tmp_path):
+        """
+        Test that `_process_full_report_coverage` sums line counts across all files, records per-file
+        percentages and the source file's own coverage.
+        """
+        source_file = tmp_path / "source.py"
+        source_file.write_text("print('source')")
+
+        generator = UnitTestValidator(
+            source_file_path=str(source_file),
+            test_file_path="test_test.py",
+            code_coverage_report_path="coverage.xml",
+            test_command="pytest",
+            test_command_dir=str(tmp_path),
+            llm_model="gpt-3",
+            agent_completion=MagicMock(),
+            max_run_time_sec=30,
+            desired_coverage=90,
+            comparison_branch="main",
+            coverage_type=CoverageType.COBERTURA,
+            diff_coverage=False,
+            num_attempts=1,
+            additional_instructions="",
+            included_files=[],
+            use_report_coverage_feature_flag=True,
+        )
+        file_coverage_dict = {
+            str(source_file): ([1, 2, 3], [4], 0.75),
+            "other.py": ([1], [2, 3, 4], 0.25),
+        }
+        coverage_percentages = {}
+
+        with patch.object(CoverageProcessor, "process_coverage_report", return_value=file_coverage_dict):
+            percentage_covered = generator._process_full_report_coverage(0, coverage_percentages)
+
+        assert percentage_covered == 0.5
+        assert coverage_percentages == {str(source_file): 0.75, "other.py": 0.25}
+        assert generator.last_source_file_coverage == 0.75
@@ -2,94 +2,47 @@ import pytest
 import textwrap
 from cover_agent.validator_utils.indentation_utils import prepare_test_code_with_indentation
 
-def test_basic_indentation():
-    """Test basic case: Unindented code needs to be indented by 4 spaces."""
-    raw_code = "print('hello')"
-    needed_indent = 4
-    
-    expected = "\n    print('hello')\n"
-    
+_MULTILINE_TEST_CODE = textwrap.dedent("""\
+def test_example():
+    assert True
+""")
+
+@pytest.mark.parametrize(
+    "raw_code, needed_indent, expected",
+    [
+        # Basic case: Unindented code needs to be indented by 4 spaces.
+        pytest.param("print('hello')", 4, "\n    print('hello')\n", id="basic"),
+        # Multi-line code: All lines must be indented.
+        # Line 1: indent=0. Delta = 4 - 0 = 4, so 4 spaces are added to the beginning of EVERY line
+        # and line 2 (already has 4) becomes 8.
+        pytest.param(
+            _MULTILINE_TEST_CODE,
+            4,
+            "\n    def test_example():\n        assert True\n",
+            id="multiline",
+        ),
+        # Code already indented to the needed level -> No further changes.
+        # Initial indent = 4. Delta = 4 - 4 = 0. Does not enter 'if', only wraps with \n
+        pytest.param("    print('hello')", 4, "\n    print('hello')\n", id="already_indented_match"),
+        # Code indented deeper than required.
+        # Note: Current logic (delta > 0) will NOT decrease indentation (unindent/dedent).
+        # Initial = 8. Needed = 4. Delta = -4, so nothing is done.
+        pytest.param(
+            "        print('hello')", 4, "\n        print('hello')\n", id="already_indented_more_than_needed"
+        ),
+        # Code slightly indented, needs further indentation.
+        # Initial = 2. Needed = 4. Delta = 2, so 2 spaces are added to the beginning.
+        pytest.param("  print('hello')", 4, "\n    print('hello')\n", id="increase_indentation"),
+        # No indentation is required (needed = 0).
+        pytest.param("print('hello')", 0, "\nprint('hello')\n", id="zero_needed_indent"),
+        # Extra empty lines at start/end are removed before wrapping.
+        # The function uses .strip('\n'), so extra empty lines will be removed before wrapping with new \n
+        pytest.param("\n\nprint('hello')\n\n", 4, "\n    print('hello')\n", id="cleanup_newlines"),
+        # Empty string: with empty input, .strip('\n') results in empty, but the final result is
+        # still \n + content + \n
+        pytest.param("", 4, "\n\n", id="empty_string"),
+    ],
+)
+def test_prepare_test_code_with_indentation(raw_code, needed_indent, expected):
+    """Test that prepare_test_code_with_indentation indents code to the needed level and wraps it in newlines."""
     assert prepare_test_code_with_indentation(needed_indent, raw_code) == expected
-
-def test_multiline_indentation():
-    """Test with multi-line code: All lines must be indented."""
-    raw_code = textwrap.dedent("""\
-    def test_example():
-        assert True
-    """)
-    needed_indent = 4
-    
-    # Logic: Line 1 indents by 4, line 2 (already has 4) adds 4 -> becomes 8
-    # Line 1: indent=0. Delta = 4 - 0 = 4.
-    # Result: Add 4 spaces to the beginning of EVERY line.
-    
-    expected = "\n    def test_example():\n        assert True\n"
-    
-    assert prepare_test_code_with_indentation(needed_indent, raw_code) == expected
-
-def test_already_indented_match():
-    """Test when code is already indented to the needed level -> No further changes."""
-    raw_code = "    print('hello')"
-    needed_indent = 4
-    
-    # Initial indent = 4. Delta = 4 - 4 = 0.
-    # Does not enter 'if', only wraps with \n
-    expected = "\n    print('hello')\n"
-    
-    assert prepare_test_code_with_indentation(needed_indent, raw_code) == expected
-
-def test_already_indented_more_than_needed():
-    """
-    Test case where code is indented deeper than required.
-    Note: Current logic (delta > 0) will NOT decrease indentation (unindent/dedent).
-    """
-    raw_code = "        print('hello')" # Indented by 8
-    needed_indent = 4
-    
-    # Initial = 8. Needed = 4. Delta = -4.
-    # Delta < 0 so nothing is done.
-    expected = "\n        print('hello')\n"
-    
-    assert prepare_test_code_with_indentation(needed_indent, raw_code) == expected
-
-def test_increase_indentation():
-    """Test case where code is slightly indented, needs further indentation."""
-    raw_code = "  print('hello')" # Indented by 2
-    needed_indent = 4
-    
-    # Initial = 2. Needed = 4. Delta = 2.
-    # Add 2 spaces to the beginning.
-    expected = "\n    print('hello')\n"
-    
-    assert prepare_test_code_with_indentation(needed_indent, raw_code) == expected
-
-def test_zero_needed_indent():
-    """Test when no indentation is required (needed = 0)."""
-    raw_code = "print('hello')"
-    needed_indent = 0
-    
-    expected = "\nprint('hello')\n"
-    
-    assert prepare_test_code_with_indentation(needed_indent, raw_code) == expected
-
-def test_cleanup_newlines():
-    """Test that the function automatically removes extra empty lines at start/end before wrapping."""
-    raw_code = "\n\nprint('hello')\n\n"
-    needed_indent = 4
-    
-    # The function uses .strip('\n'), so extra empty lines will be removed before wrapping with new \n
-    expected = "\n    print('hello')\n"
-    
-    assert prepare_test_code_with_indentation(needed_indent, raw_code) == expected
-
-def test_empty_string():
-    """Test with an empty string."""
-    raw_code = ""
-    needed_indent = 4
-    
-    # Code splits into an empty list or list containing empty strings depending on implementation
-    # But the final result is still \n + content + \n
-    # With empty input, .strip('\n') results in empty.
-    expected = "\n\n"
-    
-    assert prepare_test_code_with_indentation(needed_indent, raw_code) == expected
\ No newline at end of file
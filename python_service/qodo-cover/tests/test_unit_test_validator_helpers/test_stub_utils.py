@@ -2,96 +2,115 @@ import pytest
 import textwrap
 from cover_agent.validator_utils.stub_utils import is_trivial_stub
 
-def test_basic_pass_stub():
-    """Test case containing only a pass statement."""
-    code = textwrap.dedent("""
-        def test_example():
-            pass
-    """)
-    assert is_trivial_stub(code) is True
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        # Test case containing only a pass statement.
+        pytest.param(
+            textwrap.dedent("""
+                def test_example():
+                    pass
+            """),
+            True,
+            id="basic_pass_stub",
+        ),
+        # Test case with pass accompanied by comments (still considered a stub).
+        pytest.param(
+            textwrap.dedent("""
+                def test_todo():
+                    # TODO: Implement later
+                    # This is just a placeholder
+                    pass
+            """),
+            True,
+            id="pass_with_comments",
+        ),
+        # Test case with a print statement and a pass (Still considered a stub as it has <= 2 lines of logic).
+        pytest.param(
+            textwrap.dedent("""
+                def test_log():
+                    print("Running test")
+                    pass
+            """),
+            True,
+            id="pass_with_print",
+        ),
+        # Test a completely empty function (no logic code).
+        pytest.param(
+            textwrap.dedent("""
+                def test_empty():
 
-def test_pass_with_comments():
-    """Test case with pass accompanied by comments (still considered a stub)."""
-    code = textwrap.dedent("""
-        def test_todo():
-            # TODO: Implement later
-            # This is just a placeholder
-            pass
-    """)
-    assert is_trivial_stub(code) is True
-
-def test_pass_with_print():
-    """Test case with a print statement and a pass (Still considered a stub as it has <= 2 lines of logic)."""
-    code = textwrap.dedent("""
-        def test_log():
-            print("Running test")
-            pass
-    """)
-    assert is_trivial_stub(code) is True
-
-def test_empty_function_body():
-    """Test a completely empty function (no logic code)."""
-    code = textwrap.dedent("""
-        def test_empty():
-            
-    """)
-    assert is_trivial_stub(code) is True
-
-def test_real_assertion():
-    """Test code containing actual testing logic."""
-    code = textwrap.dedent("""
-        def test_math():
-            x = 1 + 1
-            assert x == 2
-    """)
-    assert is_trivial_stub(code) is False
-
-def test_only_assertion():
-    """Test code with only 1 line, but it is an assertion."""
-    code = textwrap.dedent("""
-        def test_simple():
-            assert True
-    """)
-    assert is_trivial_stub(code) is False
-
-def test_variable_named_password():
-    """
-    Test variable containing the word 'pass' (e.g., 'password').
-    """
-    code = textwrap.dedent("""
-        def test_login():
-            password = "123" 
-            assert login(password)
-    """)
-    assert is_trivial_stub(code) is False
-
-def test_variable_passed():
-    """Test variable named 'passed'."""
-    code = textwrap.dedent("""
-        def test_status():
-            is_passed = True
-            assert is_passed
-    """)
-    assert is_trivial_stub(code) is False
-
-def test_empty_string_input():
-    """Test input is an empty string."""
-    assert is_trivial_stub("") is True
-
-def test_input_with_only_comments():
-    """Test input containing only comments."""
-    code = """
+            """),
+            True,
+            id="empty_function_body",
+        ),
+        # Test code containing actual testing logic.
+        pytest.param(
+            textwrap.dedent("""
+                def test_math():
+                    x = 1 + 1
+                    assert x == 2
+            """),
+            False,
+            id="real_assertion",
+        ),
+        # Test code with only 1 line, but it is an assertion.
+        pytest.param(
+            textwrap.dedent("""
+                def test_simple():
+                    assert True
+            """),
+            False,
+            id="only_assertion",
+        ),
+        # Test variable containing the word 'pass' (e.g., 'password').
+        pytest.param(
+            textwrap.dedent("""
+                def test_login():
+                    password = "123"
+                    assert login(password)
+            """),
+            False,
+            id="variable_named_password",
+        ),
+        # Test variable named 'passed'.
+        pytest.param(
+            textwrap.dedent("""
+                def test_status():
+                    is_passed = True
+                    assert is_passed
+            """),
+            False,
+            id="variable_passed",
+        ),
+        # Test input is an empty string.
+        pytest.param("", True, id="empty_string_input"),
+        # Test input containing only comments.
+        pytest.param(
+            """
     # Just a comment
     # Another comment
-    """
-    assert is_trivial_stub(code) is True
-
-def test_input_without_def():
-    """Test code snippet without 'def' (only body)."""
-    code = "pass"
-    assert is_trivial_stub(code) is True
-
-def test_input_without_def_real_code():
-    """Test code snippet without 'def' but is real code."""
-    code = "x = 1\nassert x"
-    assert is_trivial_stub(code) is False
\ No newline at end of file
+    """,
+            True,
+            id="input_with_only_comments",
+        ),
+        # Test code snippet without 'def' (only body).
+        pytest.param("pass", True, id="input_without_def"),
+        # Test code snippet without 'def' but is real code.
+        pytest.param("x = 1\nassert x", False, id="input_without_def_real_code"),
+        # Test that a pass statement does not make longer test code a stub.
+        pytest.param(
+            textwrap.dedent("""
+                def test_setup():
+                    x = 1
+                    y = 2
+                    pass
+            """),
+            False,
+            id="pass_with_more_than_two_logic_lines",
+        ),
+    ],
+)
+def test_is_trivial_stub(code, expected):
+    """Test is_trivial_stub on stubs and on code with real test logic."""
+    assert is_trivial_stub(code) is expected
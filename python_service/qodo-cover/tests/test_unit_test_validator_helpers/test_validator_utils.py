@@ -2,18 +2,23 @@ import pytest
 from unittest.mock import patch
 from cover_agent.validator_utils.validator_utils import validate_initialization_params
 
+
+@pytest.fixture(autouse=True)
+def mock_exists():
+    """
+    Simulate that the source file always exists; tests that need it missing set return_value to False.
+    """
+    with patch("cover_agent.validator_utils.validator_utils.os.path.exists", return_value=True) as mock:
+        yield mock
+
 # ==========================================
 # 1. Test success case (Happy Path)
 # ==========================================
 
-@patch("os.path.exists")
-def test_validate_params_success(mock_exists):
+def test_validate_params_success():
     """
     Test case where all parameters are valid.
     """
-    # Simulate that the file always exists
-    mock_exists.return_value = True
-
     # Call function with standard parameters
     # No exception raised means the test passed
     validate_initialization_params(
@@ -28,7 +33,6 @@ def test_validate_params_success(mock_exists):
 # 2. Test file not found error
 # ==========================================
 
-@patch("os.path.exists")
 def test_source_file_not_found(mock_exists):
     """
     Test case where the file does not exist -> Must raise FileNotFoundError.
@@ -66,14 +70,10 @@ def test_source_file_not_found(mock_exists):
     # Case: Fix attempts < 0
     (50, 10, 1, -1, "max_fix_attempts must be non-negative"),
 ])
-@patch("os.path.exists")
-def test_validate_params_value_errors(mock_exists, coverage, runtime, attempts, fix_attempts, error_msg_fragment):
+def test_validate_params_value_errors(coverage, runtime, attempts, fix_attempts, error_msg_fragment):
     """
     Comprehensive test for out-of-range parameter cases.
     """
-    # Always simulate that the file exists to pass the first check
-    mock_exists.return_value = True
-
     with pytest.raises(ValueError) as exc_info:
         validate_initialization_params(
             source_file_path="dummy.py",
@@ -90,13 +90,10 @@ def test_validate_params_value_errors(mock_exists, coverage, runtime, attempts,
 # 4. Test boundary values
 # ==========================================
 
-@patch("os.path.exists")
-def test_boundary_values(mock_exists):
+def test_boundary_values():
     """
     Test values right at the limit edges (still valid).
     """
-    mock_exists.return_value = True
-    
     # Coverage = 0 (Lower bound)
     validate_initialization_params("f.py", 0, 1, 1, 0)
     